@@ -11,27 +11,51 @@ import os
 from pathlib import Path
 from typing import Optional
 
-# Add libmtcmaster python path
+# libmtcmaster python bindings and shared library
 libmtcmaster_python = Path(__file__).parent.parent.parent / "libmtcmaster" / "python"
 libmtcmaster_lib = Path(__file__).parent.parent.parent / "libmtcmaster" / "libmtcmaster.so"
-sys.path.insert(0, str(libmtcmaster_python))
 
-# Import mtcsender and patch it to use the correct library path
-original_cwd = os.getcwd()
-MTC_AVAILABLE = False
+# Availability is decided from the files on disk; importing mtcsender and
+# loading libmtcmaster.so is deferred until the first MTCHelper.setup(), so
+# scripts only parsing arguments (e.g. --help) never pay for the dlopen.
+MTC_AVAILABLE = libmtcmaster_python.is_dir() and libmtcmaster_lib.exists()
 MtcSender = None
 
-try:
-    os.chdir(libmtcmaster_python)
-    import mtcsender
-    # Patch the library path to use absolute path
-    original_init = mtcsender.MtcSender.__init__
+
+def _load_mtcsender():
+    """
+    Import mtcsender and patch it to use the absolute library path.
+    
+    The patched class is cached, so only the first call imports anything.
+    
+    Returns:
+        The patched mtcsender.MtcSender class
+    
+    Raises:
+        ImportError: if the mtcsender module cannot be imported
+    """
+    global MtcSender
+    if MtcSender is not None:
+        return MtcSender
+    
+    if str(libmtcmaster_python) not in sys.path:
+        sys.path.insert(0, str(libmtcmaster_python))
+    
+    original_cwd = os.getcwd()
+    try:
+        os.chdir(libmtcmaster_python)
+        import mtcsender
+    finally:
+        os.chdir(original_cwd)
+    
     def patched_init(self, fps=25, port=0, portname="SLMTCPort"):
         import ctypes
         # Use absolute path to library
         if not libmtcmaster_lib.exists():
             raise FileNotFoundError(f"libmtcmaster.so not found at {libmtcmaster_lib}")
-        self.mtc_lib = ctypes.CDLL(str(libmtcmaster_lib))
+        # RTLD_NOW resolves every symbol at load time, during setup, rather than
+        # lazily on the first play()/settime_frames() call
+        self.mtc_lib = ctypes.CDLL(str(libmtcmaster_lib), mode=os.RTLD_NOW | ctypes.RTLD_GLOBAL)
         self.mtc_lib.MTCSender_create.restype = ctypes.c_void_p
         self.mtcproc = self.mtc_lib.MTCSender_create()
         self.port = port
@@ -41,12 +65,7 @@ try:
         self.fps = fps
     mtcsender.MtcSender.__init__ = patched_init
     MtcSender = mtcsender.MtcSender
-    MTC_AVAILABLE = True
-except (ImportError, FileNotFoundError) as e:
-    MTC_AVAILABLE = False
-    MtcSender = None
-finally:
-    os.chdir(original_cwd)
+    return MtcSender
 
 
 class MTCHelper:
@@ -64,13 +83,33 @@ class MTCHelper:
         self.fps = fps
         self.port = port
         self.portname = portname
-        self.mtc_sender: Optional[MtcSender] = None
+        self.mtc_sender = None
         self.available = MTC_AVAILABLE
     
     def is_available(self) -> bool:
         """Check if MTC is available."""
         return self.available
     
+    def preload(self) -> bool:
+        """
+        Import the mtcsender bindings without opening a MIDI port.
+        
+        The import changes the process's working directory for a moment, so
+        call this on the main thread before running setup() on another one.
+        
+        Returns:
+            True if the bindings were loaded, False otherwise
+        """
+        if not self.available:
+            return False
+        
+        try:
+            _load_mtcsender()
+            return True
+        except ImportError as e:
+            print(f"WARNING: Failed to load mtcsender: {e}")
+            return False
+    
     def setup(self) -> bool:
         """
         Setup MTC timecode generation (but don't start playing).
@@ -82,7 +121,8 @@ class MTCHelper:
             return False
         
         try:
-            self.mtc_sender = MtcSender(fps=self.fps, port=self.port, portname=self.portname)
+            sender_class = _load_mtcsender()
+            self.mtc_sender = sender_class(fps=self.fps, port=self.port, portname=self.portname)
             print(f"DEBUG: MTC sender created (fps={self.fps}, port={self.port})")
             self.mtc_sender.settime_frames(0)
             print("DEBUG: MTC time set to frame 0 in setup()")
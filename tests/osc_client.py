@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Shared OSC (Open Sound Control) client for test scripts.
+
+Sends single-argument OSC messages to videocomposer over UDP, avoiding the
+hand-rolled send_osc_command/send_osc_string_command copies in each test.
+encode_message()/encode_bundle() build multi-argument messages and bundles
+for tests that manage their own socket.
+"""
+
+import functools
+import socket
+import struct
+from typing import List, Sequence, Tuple, Union
+
+
+# Type tags, already null-terminated and 4-byte aligned
+_TYPETAG_I = b',i\0\0'
+_TYPETAG_S = b',s\0\0'
+
+_INT_STRUCT = struct.Struct('>i')
+_FLOAT_STRUCT = struct.Struct('>f')
+_SIZE_STRUCT = struct.Struct('>I')
+# "#bundle" + timetag 1 (= dispatch immediately)
+_BUNDLE_HEADER = b'#bundle\0' + struct.pack('>Q', 1)
+# Encoded address + type tag prefixes kept by _build_prefix()
+_PREFIX_CACHE_SIZE = 256
+
+
+def _pad(data: bytes) -> bytes:
+    """Null-terminate data and pad it to a 4-byte boundary."""
+    return data + b'\0' * (4 - (len(data) & 3))
+
+
+@functools.lru_cache(maxsize=_PREFIX_CACHE_SIZE)
+def _build_prefix(path: str, typetag: bytes) -> bytes:
+    """
+    Encode the padded address + type tag that starts an OSC message.
+
+    Results are cached, so repeated messages to the same path with the
+    same argument types only encode their arguments.
+    """
+    return _pad(path.encode('utf-8')) + typetag
+
+
+def _encode_arg(value: Union[int, float, str]) -> Tuple[str, bytes]:
+    """Return the type tag character and encoded bytes of one argument."""
+    if isinstance(value, str):
+        return 's', _pad(value.encode('utf-8'))
+    if isinstance(value, float):
+        return 'f', _FLOAT_STRUCT.pack(value)
+    return 'i', _INT_STRUCT.pack(value)
+
+
+# Encode the fixed OSD test commands at import
+for _path, _typetag in (
+    ('/videocomposer/osd/smpte', _TYPETAG_S),
+    ('/videocomposer/osd/frame', _TYPETAG_I),
+    ('/videocomposer/osd/text', _TYPETAG_S),
+    ('/videocomposer/osd/box', _TYPETAG_I),
+    ('/videocomposer/cmd', _TYPETAG_S),
+    ('/videocomposer/quit', _TYPETAG_I),
+):
+    _build_prefix(_path, _typetag)
+del _path, _typetag
+
+
+def encode_message(path: str, args: Sequence[Union[int, float, str]]) -> bytes:
+    """
+    Encode an OSC message with any number of int, float or str arguments.
+
+    The address + type tag prefix comes from the _build_prefix() cache.
+
+    Args:
+        path: OSC address
+        args: Arguments; str is sent as 's', float as 'f', int as 'i'
+
+    Returns:
+        The encoded message
+    """
+    tags = []
+    data = []
+    for value in args:
+        tag, encoded = _encode_arg(value)
+        tags.append(tag)
+        data.append(encoded)
+    typetag = _pad((',' + ''.join(tags)).encode('ascii'))
+    return _build_prefix(path, typetag) + b''.join(data)
+
+
+def encode_bundle(elements: Sequence[bytes]) -> bytes:
+    """
+    Encode already encoded messages as one OSC bundle, dispatched immediately.
+
+    Args:
+        elements: Encoded messages, e.g. from encode_message()
+
+    Returns:
+        The encoded bundle
+    """
+    return _BUNDLE_HEADER + b''.join(
+        _SIZE_STRUCT.pack(len(element)) + element for element in elements)
+
+
+class OscClient:
+    """
+    Minimal OSC sender using one UDP socket for its whole lifetime.
+
+    The padded address + type tag prefix comes from the shared
+    _build_prefix() cache, so repeated sends to the same path only encode
+    the argument.
+    """
+
+    def __init__(self, port: int, host: str = '127.0.0.1'):
+        """
+        Initialize the OSC client.
+
+        Args:
+            port: OSC port videocomposer is listening on
+            host: Host to send to (default: 127.0.0.1)
+        """
+        self._addr = (host, port)
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def _encode(self, path: str, value: Union[int, str]) -> bytes:
+        """Encode an OSC message with one int or string argument."""
+        if isinstance(value, str):
+            return _build_prefix(path, _TYPETAG_S) + _pad(value.encode('utf-8'))
+        return _build_prefix(path, _TYPETAG_I) + _INT_STRUCT.pack(value)
+
+    def send_int(self, path: str, value: int):
+        """Send OSC message with integer argument."""
+        try:
+            self._sock.sendto(self._encode(path, value), self._addr)
+        except Exception as e:
+            print(f"    Warning: Failed to send OSC command: {e}")
+
+    def send_string(self, path: str, value: str):
+        """Send OSC message with string argument."""
+        try:
+            self._sock.sendto(self._encode(path, value), self._addr)
+        except Exception as e:
+            print(f"    Warning: Failed to send OSC string command: {e}")
+
+    def send_bundle(self, messages: List[Tuple[str, Union[int, str]]]):
+        """
+        Send several messages as one OSC bundle, dispatched immediately.
+
+        Args:
+            messages: (path, value) pairs; str values are sent as 's',
+                      int values as 'i'
+        """
+        bundle = encode_bundle([self._encode(path, value) for path, value in messages])
+        try:
+            self._sock.sendto(bundle, self._addr)
+        except Exception as e:
+            print(f"    Warning: Failed to send OSC bundle: {e}")
+
+    def close(self):
+        """Close the underlying socket."""
+        self._sock.close()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Shared process helpers for test scripts that drive videocomposer over OSC.
+
+Waiting with time.sleep() while videocomposer writes to a PIPE lets the pipe
+fill up and stall the child, and hides a crash until the sleep is over.
+OutputPump.wait() replaces those sleeps: it keeps the pipe drained and stops
+as soon as the process exits. wait_for_osc_port() replaces the fixed startup
+sleep with a check for videocomposer's OSC socket, and spawn() starts the
+process the cheapest way CPython allows.
+"""
+
+import os
+import select
+import subprocess
+import time
+
+# How often wait_for_osc_port() checks for the bound port
+_PORT_POLL_INTERVAL = 0.05
+
+
+class ProcessExitedError(Exception):
+    """Raised when the pumped process exits during OutputPump.wait()."""
+
+
+def spawn(cmd, **popen_kwargs) -> subprocess.Popen:
+    """
+    Start videocomposer with subprocess.Popen, letting CPython use posix_spawn.
+
+    CPython only uses posix_spawn (vfork) instead of fork+exec when
+    close_fds is False and no preexec_fn, pass_fds, cwd or new session is
+    requested. Keeping close_fds False leaks nothing: fds Python creates
+    are non-inheritable anyway.
+
+    Args:
+        cmd: Command line, starting with the videocomposer binary or wrapper
+        **popen_kwargs: Further subprocess.Popen arguments (stdout, env, ...)
+
+    Returns:
+        The started process
+    """
+    return subprocess.Popen(cmd, close_fds=False, **popen_kwargs)
+
+
+class OutputPump:
+    """Drain a process's stdout while waiting between test steps."""
+
+    def __init__(self, process: subprocess.Popen):
+        """
+        Initialize the pump.
+
+        Args:
+            process: Process started with stdout=subprocess.PIPE
+        """
+        self._process = process
+        self._fd = process.stdout.fileno()
+        os.set_blocking(self._fd, False)
+        self._poller = select.poll()
+        self._poller.register(self._fd, select.POLLIN)
+
+    def wait(self, seconds: float):
+        """
+        Wait for the given time, discarding any output the process writes.
+
+        Args:
+            seconds: Time to wait
+
+        Raises:
+            ProcessExitedError: if the process exits before the time is up
+        """
+        deadline = time.monotonic() + seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if not self._poller.poll(remaining * 1000):
+                continue
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                continue
+            if not data:
+                # EOF: the process closed its output, i.e. it exited
+                self._poller.unregister(self._fd)
+                try:
+                    returncode = self._process.wait(timeout=1)
+                except subprocess.TimeoutExpired:
+                    returncode = None
+                raise ProcessExitedError(f"videocomposer exited early (code {returncode})")
+
+
+def _udp_port_bound(port: int) -> bool:
+    """Check /proc/net/udp{,6} for a socket bound to the given local port."""
+    suffix = f":{port:04X}"
+    for table in ("/proc/net/udp", "/proc/net/udp6"):
+        try:
+            with open(table) as f:
+                next(f)  # Header
+                for line in f:
+                    # local_address is e.g. "00000000:1E5A"
+                    if line.split(None, 2)[1].endswith(suffix):
+                        return True
+        except OSError:
+            continue
+    return False
+
+
+def wait_for_osc_port(process: subprocess.Popen, port: int, timeout: float) -> bool:
+    """
+    Wait until the process has bound its OSC port.
+
+    The check needs /proc; without it the full timeout is waited.
+
+    Args:
+        process: The videocomposer process
+        port: UDP port it was told to listen on
+        timeout: Longest time to wait
+
+    Returns:
+        True if the port was bound, False if the process exited or the
+        timeout passed first
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return False
+        if _udp_port_bound(port):
+            return True
+        time.sleep(_PORT_POLL_INTERVAL)
+    return False
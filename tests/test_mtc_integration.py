@@ -18,26 +18,116 @@ import time
 import subprocess
 import signal
 import argparse
+import queue
 import re
+import select
+import threading
 from pathlib import Path
 
 # Import shared MTC helper
 from mtc_helper import MTCHelper, MTC_AVAILABLE
 
+# Everything check_mtc_output() looks for, matched in a single case-insensitive
+# pass. Longer phrases come first so they win over the words they contain.
+_MTC_TOKEN_RE = re.compile(
+    r'mtc:|selected midi driver|midi sync source initialized|waiting|time ?code'
+    r'|started rolling|rolling|stopped|istimecoderunning changed|true'
+    r'|pollframe|returning frame|frame'
+    r'|\d{2}:\d{2}:\d{2}[.:]\d{2}',  # e.g. "MTC: 00:01:02:03 (frame 1553, rolling)"
+    re.IGNORECASE,
+)
+# Tokens that stand for more than themselves: spelling variants, and phrases
+# that swallow a shorter token the checks also need
+_MTC_TOKEN_EXPANSIONS = {
+    "time code": ("timecode",),
+    "started rolling": ("started rolling", "rolling"),
+    "istimecoderunning changed": ("istimecoderunning changed", "timecode"),
+    "pollframe": ("pollframe", "frame"),
+    "returning frame": ("returning frame", "frame"),
+}
+
+# Longest a monitor loop blocks waiting for output before re-checking poll(),
+# in case the child exits while something else still holds its stdout open
+_POLL_INTERVAL = 0.5
+# monitor_process() may finish early once the MTC pass criteria are met, but
+# only after watching the process for at least this long
+_MIN_OBSERVATION_SECONDS = 1.0
+# ...and gives up early if MIDI has not initialized within this many seconds
+_MIDI_INIT_TIMEOUT = 4.0
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+_WRAPPER = _PROJECT_ROOT / "scripts" / "cuems-videocomposer-wrapper.sh"
+# Directories searched (in order) for the default test video
+_DEFAULT_SEARCH_DIRS = (
+    _PROJECT_ROOT / "video_test_files",  # video_test_files folder (first priority)
+    _PROJECT_ROOT,  # Project root
+    Path.home() / "Videos",  # ~/Videos
+    Path("/home/ion/Videos"),  # Explicit path
+)
+
+
+def _wait_with_pidfd(proc, timeout):
+    """Wait for a child process to exit, waking as soon as it is reaped.
+
+    Uses a pidfd (Linux >= 5.3) so the wait is event-driven instead of the
+    sleep-based polling done by Popen.wait(timeout=...). Falls back to the
+    stdlib wait where pidfd_open is not available.
+
+    Raises:
+        subprocess.TimeoutExpired: if the process is still running after timeout
+    """
+    try:
+        fd = os.pidfd_open(proc.pid)
+    except (AttributeError, OSError):
+        return proc.wait(timeout=timeout)
+    try:
+        poller = select.poll()
+        poller.register(fd, select.POLLIN)
+        events = poller.poll(timeout * 1000)
+    finally:
+        os.close(fd)
+    if not events:
+        raise subprocess.TimeoutExpired(proc.args, timeout)
+    return proc.wait()
+
 
 class MTCIntegrationTest:
+    # Fixed attribute set: no per-instance __dict__, and a mistyped attribute
+    # name fails loudly instead of silently creating a new one
+    __slots__ = (
+        'video_path', 'video_exists',
+        'videocomposer_path', 'videocomposer_exists', 'videocomposer_argv',
+        'duration', 'fps', 'mtc_port', 'mtc_helper',
+        'videocomposer_process', '_line_q', '_reader_thread',
+        'test_passed',
+        'mtc_waiting_seen', 'mtc_rolling_seen', 'mtc_frame_updates_seen', '_all_seen',
+    )
+    
     def __init__(self, video_path, duration=10, fps=25.0, mtc_port=0):
         self.video_path = Path(video_path)
+        # Resolve paths once; launch_videocomposer() reuses these results
+        self.video_exists = self.video_path.exists()
+        self.videocomposer_path = _WRAPPER
+        self.videocomposer_exists = self.videocomposer_path.exists()
+        # Pre-built argv (str only) - include video file only if it exists
+        self.videocomposer_argv = [str(self.videocomposer_path)]
+        if self.video_exists:
+            self.videocomposer_argv.append(str(self.video_path))
+        self.videocomposer_argv.extend(["--midi", "-1", "--verbose"])  # -1 = autodetect (connects to Midi Through)
         self.duration = duration
         self.fps = fps
         self.mtc_port = mtc_port
         self.mtc_helper = MTCHelper(fps=fps, port=mtc_port, portname="VideocomposerTest")
         self.videocomposer_process = None
+        # Output lines from the reader thread; None marks end of stdout
+        self._line_q = queue.SimpleQueue()
+        self._reader_thread = None
         self.test_passed = False
         # MTC reception tracking
         self.mtc_waiting_seen = False  # "MTC: Waiting for MIDI Time Code..."
         self.mtc_rolling_seen = False  # "MTC: Started rolling"
         self.mtc_frame_updates_seen = False  # "MTC: frame" or "MTC: XX:XX:XX:XX"
+        self._all_seen = False  # All three flags latched; nothing left to check
         
     def setup_mtc(self):
         """Initialize and start MTC timecode generation."""
@@ -95,42 +185,47 @@ class MTCIntegrationTest:
     
     def launch_videocomposer(self):
         """Launch the videocomposer application with the test video."""
-        videocomposer_path = Path(__file__).parent.parent / "scripts" / "cuems-videocomposer-wrapper.sh"
+        videocomposer_path = self.videocomposer_path
         
-        if not videocomposer_path.exists():
+        if not self.videocomposer_exists:
             print(f"ERROR: videocomposer wrapper script not found at {videocomposer_path}")
             print("Make sure scripts/cuems-videocomposer-wrapper.sh exists")
             return False
         
-        # Build command - include video file only if it exists
-        cmd = [str(videocomposer_path)]
+        cmd = self.videocomposer_argv
         
-        if self.video_path.exists():
+        if self.video_exists:
             print(f"Launching videocomposer with video: {self.video_path}")
-            cmd.append(str(self.video_path))
         else:
             print(f"WARNING: Test video not found at {self.video_path}")
             print("Launching videocomposer without video file (testing MTC sync only)")
         
-        # Add MIDI and verbose options
-        cmd.extend(["--midi", "-1", "--verbose"])  # -1 = autodetect (connects to Midi Through)
-        
         try:
             # Set up environment - don't force DISPLAY
             env = os.environ.copy()
             # Don't force DISPLAY - let the application use the environment's DISPLAY
             # or fall back to DRM/KMS/headless mode if no display server is available
             
-            # Merge stderr into stdout to capture all MTC messages
+            # Merge stderr into stdout to capture all MTC messages.
+            # cmd holds only str entries with an absolute executable and we pass
+            # no preexec_fn/pass_fds/cwd and close_fds=False, so CPython launches
+            # via posix_spawn (vfork) instead of fork+exec. Python-created fds
+            # are non-inheritable, so nothing extra leaks into the child.
             self.videocomposer_process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,  # Merge stderr into stdout
-                text=True,
-                bufsize=1,  # Line buffered
+                bufsize=65536,  # Block-buffered bytes; the reader thread decodes lines
+                close_fds=False,
                 env=env
             )
             
+            # Blocking reads happen on a daemon thread; the monitor loops just
+            # wait on the line queue with their own deadlines
+            self._line_q = queue.SimpleQueue()
+            self._reader_thread = threading.Thread(target=self._reader, daemon=True)
+            self._reader_thread.start()
+            
             print(f"Videocomposer launched (PID: {self.videocomposer_process.pid})")
             print("Note: Both MTC sender and videocomposer automatically connect to 'Midi Through'")
             
@@ -142,28 +237,39 @@ class MTCIntegrationTest:
     
     def check_mtc_output(self, line):
         """Check if a line contains MTC-related output and update tracking."""
-        line_lower = line.lower()
+        if self._all_seen:
+            return
+        tokens = set()
+        for token in _MTC_TOKEN_RE.findall(line):
+            if token[0].isdigit():
+                tokens.add("hh:mm:ss:ff")
+            else:
+                token = token.lower()
+                tokens.update(_MTC_TOKEN_EXPANSIONS.get(token, (token,)))
+        if not tokens:
+            return
+        is_mtc = "mtc:" in tokens
         
         # Check for MIDI driver selection (indicates MIDI is being initialized)
-        if "selected midi driver" in line_lower or "midi sync source initialized" in line_lower:
+        if "selected midi driver" in tokens or "midi sync source initialized" in tokens:
             if not self.mtc_waiting_seen:
                 print("✓ MTC: MIDI driver selected/initialized")
                 self.mtc_waiting_seen = True
         
         # Check for "MTC: Waiting for MIDI Time Code..." (with or without [INFO] prefix)
-        if "mtc:" in line_lower and "waiting" in line_lower and ("time code" in line_lower or "timecode" in line_lower):
+        if is_mtc and "waiting" in tokens and "timecode" in tokens:
             if not self.mtc_waiting_seen:
                 print("✓ MTC: MIDI initialized and waiting for timecode")
                 self.mtc_waiting_seen = True
         
         # Check for "MTC: Started rolling" (with or without [INFO] prefix)
-        if "mtc:" in line_lower and "started rolling" in line_lower:
+        if is_mtc and "started rolling" in tokens:
             if not self.mtc_rolling_seen:
                 print("✓ MTC: Timecode received and started rolling!")
                 self.mtc_rolling_seen = True
         
         # Check for "MTC: isTimecodeRunning changed: true" (indicates MTC is running)
-        if "mtc:" in line_lower and "istimecoderunning changed" in line_lower and "true" in line_lower:
+        if is_mtc and "istimecoderunning changed" in tokens and "true" in tokens:
             if not self.mtc_rolling_seen:
                 print("✓ MTC: Timecode running detected!")
                 self.mtc_rolling_seen = True
@@ -173,14 +279,83 @@ class MTCIntegrationTest:
         # - "MTC: frame X (rolling)"
         # - "MTC: XX:XX:XX:XX (frame X, rolling)"
         # - "MTC: pollFrame() returning frame X"
-        if "mtc:" in line_lower:
+        if is_mtc:
             # Check if it's a frame update (not just "waiting" or "rolling" messages)
-            if ("frame" in line_lower and ("rolling" in line_lower or "stopped" in line_lower)) or \
-               re.search(r'\d{2}:\d{2}:\d{2}[.:]\d{2}', line) or \
-               ("pollframe" in line_lower and "returning frame" in line_lower):
+            if ("frame" in tokens and ("rolling" in tokens or "stopped" in tokens)) or \
+               "hh:mm:ss:ff" in tokens or \
+               ("pollframe" in tokens and "returning frame" in tokens):
                 if not self.mtc_frame_updates_seen:
                     print("✓ MTC: Frame updates detected")
                     self.mtc_frame_updates_seen = True
+        
+        self._all_seen = self.mtc_waiting_seen and self.mtc_rolling_seen and self.mtc_frame_updates_seen
+    
+    def _reader(self):
+        """Reader thread: queue each decoded stdout line, then None at EOF."""
+        try:
+            # Each refill of the 64 KiB buffer is one read() syscall; lines are
+            # split out of it in C rather than read one by one
+            for raw in self.videocomposer_process.stdout:
+                self._line_q.put(raw.decode('utf-8', 'replace').strip())
+        except (OSError, ValueError):
+            pass
+        self._line_q.put(None)
+    
+    def handle_output_batch(self, lines):
+        """Echo lines of videocomposer output and check them for MTC status.
+        
+        The batch is echoed with one write and one flush rather than one
+        print() per line.
+        """
+        if not lines:
+            return
+        sys.stdout.write("".join(f"[videocomposer] {line}\n" for line in lines))
+        sys.stdout.flush()
+        for line in lines:
+            self.check_mtc_output(line)
+    
+    def _iter_output(self, deadline):
+        """Yield batches of output lines until the deadline or the child exits.
+        
+        Wakes at least every _POLL_INTERVAL seconds (yielding an empty batch if
+        nothing arrived) so callers can run their own periodic checks.
+        """
+        while (remaining := deadline - time.monotonic()) > 0:
+            if self.videocomposer_process.poll() is not None:
+                return
+            
+            batch = []
+            eof = False
+            try:
+                line = self._line_q.get(timeout=min(remaining, _POLL_INTERVAL))
+                # Batch-drain whatever else is already queued in the same wake
+                while line is not None:
+                    batch.append(line)
+                    line = self._line_q.get_nowait()
+                eof = True
+            except queue.Empty:
+                pass
+            
+            yield batch
+            
+            if eof:
+                # stdout closed - the child is exiting; wait so poll() sees it
+                try:
+                    self.videocomposer_process.wait(timeout=_POLL_INTERVAL)
+                except subprocess.TimeoutExpired:
+                    pass
+    
+    def drain_output(self):
+        """Process every output line already queued by the reader thread."""
+        batch = []
+        while True:
+            try:
+                line = self._line_q.get_nowait()
+            except queue.Empty:
+                break
+            if line is not None:
+                batch.append(line)
+        self.handle_output_batch(batch)
     
     def verify_mtc_reception(self, timeout=5.0):
         """Verify that MTC is being received by the application.
@@ -192,28 +367,13 @@ class MTCIntegrationTest:
             True if MTC reception is confirmed, False otherwise
         """
         print(f"\nVerifying MTC reception (timeout: {timeout}s)...")
-        start_time = time.time()
-        last_status_time = start_time
+        start_time = time.monotonic()
+        deadline = start_time + timeout
+        next_status_time = start_time + 2.0
         
-        while time.time() - start_time < timeout:
-            if self.videocomposer_process.poll() is not None:
-                print("ERROR: videocomposer exited before MTC verification")
-                return False
-            
-            # Read output non-blocking
-            try:
-                import select
-                if self.videocomposer_process.stdout:
-                    ready, _, _ = select.select([self.videocomposer_process.stdout], [], [], 0.1)
-                    if ready:
-                        line = self.videocomposer_process.stdout.readline()
-                        if line:
-                            line = line.strip()
-                            # Print all output for debugging
-                            print(f"[videocomposer] {line}")
-                            self.check_mtc_output(line)
-            except (ImportError, OSError, ValueError):
-                pass
+        for batch in self._iter_output(deadline):
+            # Print all output for debugging
+            self.handle_output_batch(batch)
             
             # Check if we've seen all required MTC indicators
             if self.mtc_waiting_seen and self.mtc_rolling_seen:
@@ -221,12 +381,14 @@ class MTCIntegrationTest:
                 return True
             
             # Print status every 2 seconds
-            if time.time() - last_status_time >= 2.0:
-                elapsed = time.time() - start_time
-                print(f"  Still waiting for MTC... ({elapsed:.1f}s elapsed)")
-                last_status_time = time.time()
-            
-            time.sleep(0.1)
+            now = time.monotonic()
+            if now >= next_status_time:
+                print(f"  Still waiting for MTC... ({now - start_time:.1f}s elapsed)")
+                next_status_time = now + 2.0
+        
+        if self.videocomposer_process.poll() is not None:
+            print("ERROR: videocomposer exited before MTC verification")
+            return False
         
         # Report what we found
         print(f"\nMTC Reception Status:")
@@ -245,107 +407,62 @@ class MTCIntegrationTest:
         
         return True
     
-    def monitor_process_partial(self, duration):
-        """Monitor the videocomposer process for a partial duration."""
-        if not self.videocomposer_process:
-            return False
+    def _monitor(self, duration, mark_passed=False):
+        """Monitor the videocomposer process for a given duration.
         
-        start_time = time.time()
-        last_output_time = start_time
-        
-        while time.time() - start_time < duration:
-            # Check if process is still running
-            if self.videocomposer_process.poll() is not None:
-                # Process has terminated
-                return_code = self.videocomposer_process.returncode
-                stdout, stderr = self.videocomposer_process.communicate()
-                
-                if return_code != 0:
-                    print(f"ERROR: videocomposer exited with code {return_code}")
-                    # stdout contains both stdout and stderr (merged)
-                    if stdout:
-                        print("OUTPUT:", stdout)
-                    return False
-                else:
-                    print("videocomposer exited normally")
-                    return True
-            
-            # Check for output (indicates it's running) - non-blocking
-            try:
-                import select
-                if self.videocomposer_process.stdout:
-                    # Check if data is available (non-blocking)
-                    ready, _, _ = select.select([self.videocomposer_process.stdout], [], [], 0.01)
-                    if ready:
-                        line = self.videocomposer_process.stdout.readline()
-                        if line:
-                            line = line.strip()
-                            print(f"[videocomposer] {line}")
-                            self.check_mtc_output(line)
-                            last_output_time = time.time()
-            except (ImportError, OSError, ValueError):
-                # select might not work on all platforms or with pipes
-                # Just continue monitoring without reading output
-                pass
-            
-            time.sleep(0.1)
+        Args:
+            duration: How long to monitor (seconds)
+            mark_passed: If True, evaluate the MTC pass criteria at the end and
+                set self.test_passed; otherwise only require that the process
+                did not fail
         
-        # If we get here, the process ran for the duration without crashing
-        if self.videocomposer_process.poll() is None:
-            return True
-        else:
-            return False
-    
-    def monitor_process(self):
-        """Monitor the videocomposer process and check for errors."""
+        Returns:
+            True if the process behaved as expected, False otherwise
+        """
         if not self.videocomposer_process:
             return False
         
-        start_time = time.time()
-        last_output_time = start_time
+        start_time = time.monotonic()
+        deadline = start_time + duration
+        # Seconds after which the pass criteria ended monitoring, if they did
+        passed_after = None
         
-        print(f"Monitoring videocomposer for {self.duration} seconds...")
+        for batch in self._iter_output(deadline):
+            # Output indicates it's running
+            self.handle_output_batch(batch)
+            
+            if not mark_passed:
+                continue
+            elapsed = time.monotonic() - start_time
+            # Stop early once the pass criteria are met...
+            if self.mtc_waiting_seen and \
+               (self.mtc_rolling_seen or self.mtc_frame_updates_seen) and \
+               elapsed >= _MIN_OBSERVATION_SECONDS:
+                passed_after = elapsed
+                break
+            # ...or once it is clear the MIDI connection failed
+            if not self.mtc_waiting_seen and elapsed > _MIDI_INIT_TIMEOUT:
+                print(f"MIDI not initialized after {_MIDI_INIT_TIMEOUT:.0f}s, ending monitoring early")
+                break
         
-        while time.time() - start_time < self.duration:
-            # Check if process is still running
-            poll_result = self.videocomposer_process.poll()
-            if poll_result is not None:
-                # Process has terminated
-                return_code = poll_result
-                # Read any remaining output (non-blocking since process is done)
-                try:
-                    remaining_output = self.videocomposer_process.stdout.read()
-                    if remaining_output:
-                        print("Remaining output:", remaining_output)
-                except:
-                    pass
-                
-                if return_code != 0:
-                    print(f"ERROR: videocomposer exited with code {return_code}")
-                    return False
-                else:
-                    print("videocomposer exited normally")
-                    break
+        return_code = self.videocomposer_process.poll()
+        if return_code is not None:
+            # Process has terminated - let the reader thread reach EOF and
+            # process the remaining output (stdout and stderr, merged)
+            self._reader_thread.join(timeout=1.0)
+            self.drain_output()
             
-            # Check for output (indicates it's running) - non-blocking
-            try:
-                import select
-                if self.videocomposer_process.stdout:
-                    # Check if data is available (non-blocking)
-                    ready, _, _ = select.select([self.videocomposer_process.stdout], [], [], 0.01)
-                    if ready:
-                        line = self.videocomposer_process.stdout.readline()
-                        if line:
-                            line = line.strip()
-                            print(f"[videocomposer] {line}")
-                            self.check_mtc_output(line)
-                            last_output_time = time.time()
-            except (ImportError, OSError, ValueError):
-                # select might not work on all platforms or with pipes
-                # Just continue monitoring without reading output
-                pass
+            if return_code != 0:
+                print(f"ERROR: videocomposer exited with code {return_code}")
+                return False
             
-            time.sleep(0.1)
+            print("videocomposer exited normally")
+            if not mark_passed:
+                return True
+        
+        if not mark_passed:
+            # The process ran for the duration without crashing
+            return self.videocomposer_process.poll() is None
         
         # Final MTC reception check
         print("\nFinal MTC Reception Status:")
@@ -353,30 +470,41 @@ class MTCIntegrationTest:
         print(f"  MTC rolling: {'✓' if self.mtc_rolling_seen else '✗'}")
         print(f"  Frame updates: {'✓' if self.mtc_frame_updates_seen else '✗'}")
         
-        # If we get here, the process ran for the duration without crashing
-        if self.videocomposer_process.poll() is None:
-            print("✓ videocomposer ran successfully for the test duration")
-            # Test passes if:
-            # 1. Process ran successfully AND
-            # 2. MIDI was initialized (connection established) AND
-            # 3. Either MTC is rolling OR we saw frame updates (indicating MTC is working)
-            if self.mtc_waiting_seen and (self.mtc_rolling_seen or self.mtc_frame_updates_seen):
-                self.test_passed = True
-                print("✓ MTC reception confirmed")
-                return True
-            elif self.mtc_waiting_seen:
-                # MIDI initialized but MTC not confirmed - this might be OK if MTC takes time
-                print("WARNING: MIDI initialized but MTC rolling not confirmed")
-                print("  This may be normal - MTC connection can take time to establish")
-                print("  The test will pass if MIDI is initialized (connection established)")
-                # Accept MIDI initialization as success for now
-            self.test_passed = True
-            return True
-            else:
-                print("ERROR: MIDI not initialized - connection failed")
-                return False
+        if self.videocomposer_process.poll() is not None:
+            return False
+        
+        if passed_after is not None:
+            print(f"✓ MTC sync confirmed after {passed_after:.1f}s; ending early")
         else:
+            # If we get here, the process ran for the duration without crashing
+            print("✓ videocomposer ran successfully for the test duration")
+        # Test passes if:
+        # 1. Process ran successfully AND
+        # 2. MIDI was initialized (connection established) AND
+        # 3. Either MTC is rolling OR we saw frame updates (indicating MTC is working)
+        if not self.mtc_waiting_seen:
+            print("ERROR: MIDI not initialized - connection failed")
             return False
+        
+        if self.mtc_rolling_seen or self.mtc_frame_updates_seen:
+            print("✓ MTC reception confirmed")
+        else:
+            # MIDI initialized but MTC not confirmed - this might be OK if MTC takes time
+            print("WARNING: MIDI initialized but MTC rolling not confirmed")
+            print("  This may be normal - MTC connection can take time to establish")
+            print("  The test will pass if MIDI is initialized (connection established)")
+            # Accept MIDI initialization as success for now
+        self.test_passed = True
+        return True
+    
+    def monitor_process_partial(self, duration):
+        """Monitor the videocomposer process for a partial duration."""
+        return self._monitor(duration)
+    
+    def monitor_process(self):
+        """Monitor the videocomposer process and check for errors."""
+        print(f"Monitoring videocomposer for {self.duration} seconds...")
+        return self._monitor(self.duration, mark_passed=True)
     
     def cleanup(self):
         """Clean up resources."""
@@ -392,7 +520,7 @@ class MTCIntegrationTest:
                 self.videocomposer_process.terminate()
                 # Wait up to 5 seconds for graceful shutdown
                 try:
-                    self.videocomposer_process.wait(timeout=5)
+                    _wait_with_pidfd(self.videocomposer_process, 5)
                 except subprocess.TimeoutExpired:
                     print("Force killing videocomposer...")
                     self.videocomposer_process.kill()
@@ -450,9 +578,10 @@ class MTCIntegrationTest:
                     return False
                 
                 print("\nStep 2: Seeking to 2:00:00:00 (minute 2)...")
+                # The full-frame message is queued on the ALSA sequencer in
+                # order, so the next monitor window observes the seek directly
                 if not self.seek_mtc(minutes=2, seconds=0, frames=0):
                     return False
-                time.sleep(0.5)  # Wait for seek to be processed
                 
                 print("\nStep 3: Playing for 20 seconds after seek...")
                 success = self.monitor_process_partial(20)
@@ -474,6 +603,21 @@ class MTCIntegrationTest:
             self.cleanup()
 
 
+def _find_test_video(filename):
+    """Return the path of filename in the first search dir that has it, or None.
+    
+    Each directory is listed once with os.scandir; missing directories are skipped.
+    """
+    for directory in _DEFAULT_SEARCH_DIRS:
+        try:
+            with os.scandir(directory) as entries:
+                if any(entry.name == filename for entry in entries):
+                    return directory / filename
+        except OSError:
+            continue
+    return None
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Integration test for cuems-videocomposer with MTC timecode"
@@ -520,8 +664,7 @@ def main():
         video_path = Path(args.video_path)
         if not video_path.is_absolute():
             # Try relative to project root
-            project_root = Path(__file__).parent.parent
-            test_video = project_root / video_path
+            test_video = _PROJECT_ROOT / video_path
             if test_video.exists():
                 video_path = test_video
             elif video_path.exists():
@@ -537,27 +680,15 @@ def main():
         else:
             video_filename = "problematic.mp4"  # Default to problematic.mp4
         
-        project_root = Path(__file__).parent.parent
-        search_paths = [
-            project_root / "video_test_files" / video_filename,  # video_test_files folder (first priority)
-            project_root / video_filename,  # Project root
-            Path.home() / "Videos" / video_filename,  # ~/Videos
-            Path("/home/ion/Videos") / video_filename,  # Explicit path
-        ]
-        
-        video_path = None
-        for path in search_paths:
-            if path.exists():
-                video_path = path
-                print(f"Found test video at: {video_path}")
-                break
-        
-        if not video_path:
+        video_path = _find_test_video(video_filename)
+        if video_path:
+            print(f"Found test video at: {video_path}")
+        else:
             print(f"Warning: Test video '{video_filename}' not found in common locations:")
-            for path in search_paths:
-                print(f"  - {path}")
+            for directory in _DEFAULT_SEARCH_DIRS:
+                print(f"  - {directory / video_filename}")
             print("The test will still run but videocomposer may fail to load the video")
-            video_path = project_root / video_filename  # Use as placeholder
+            video_path = _PROJECT_ROOT / video_filename  # Use as placeholder
     
     # Create and run test
     test = MTCIntegrationTest(
@@ -14,56 +14,85 @@ import os
 import time
 import subprocess
 import argparse
+import functools
+import shutil
+import threading
 from pathlib import Path
 
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+_WRAPPER = _PROJECT_ROOT / "scripts" / "cuems-videocomposer-wrapper.sh"
+
 # Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(_PROJECT_ROOT))
+
+@functools.lru_cache(maxsize=1)
+def _resolve_videocomposer_bin():
+    """
+    Locate the videocomposer launcher once per process.
+    
+    Returns the wrapper script if present, else cuems-videocomposer from PATH,
+    else None.
+    """
+    if _WRAPPER.is_file():
+        return _WRAPPER
+    bin_path = shutil.which("cuems-videocomposer")
+    return Path(bin_path) if bin_path else None
 
 def discover_ndi_sources(timeout_seconds=5):
     """
     Discover NDI sources using videocomposer's --discover-ndi flag.
     """
-    videocomposer_bin = Path(__file__).parent.parent / "scripts" / "cuems-videocomposer-wrapper.sh"
-    
-    # Try system path if wrapper script doesn't exist
-    if not videocomposer_bin.exists():
-        import shutil
-        bin_path = shutil.which("cuems-videocomposer")
-        if bin_path:
-            videocomposer_bin = Path(bin_path)
-        else:
-            print("ERROR: videocomposer wrapper script not found.")
-            print(f"  Expected at: {videocomposer_bin}")
-            return []
+    videocomposer_bin = _resolve_videocomposer_bin()
+    if videocomposer_bin is None:
+        print("ERROR: videocomposer wrapper script not found.")
+        print(f"  Expected at: {_WRAPPER}")
+        return []
     
     try:
-        # Call videocomposer with --discover-ndi flag
-        result = subprocess.run(
+        # Call videocomposer with --discover-ndi flag and parse its output as
+        # it streams in; stderr is not used
+        with subprocess.Popen(
             [str(videocomposer_bin), "--discover-ndi", str(timeout_seconds)],
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True,
-            timeout=timeout_seconds + 5
-        )
-        
-        # Parse output
-        sources = []
-        in_sources_list = False
-        
-        for line in result.stdout.split('\n'):
-            line = line.strip()
-            if not line:
-                continue
+            bufsize=65536
+        ) as proc:
+            # Bound the whole run: killing the child ends the read loop below
+            timed_out = threading.Event()
+            
+            def kill_on_timeout():
+                timed_out.set()
+                proc.kill()
+            
+            killer = threading.Timer(timeout_seconds + 5, kill_on_timeout)
+            killer.start()
+            try:
+                sources = []
+                in_sources_list = False
+                
+                for line in proc.stdout:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    
+                    # Look for numbered list items
+                    if line[0].isdigit() and '. ' in line:
+                        # Extract source name (everything after "N. ")
+                        source = line.split('. ', 1)[1] if '. ' in line else line
+                        sources.append(source)
+                        in_sources_list = True
+                    elif in_sources_list and line.startswith('-'):
+                        # Alternative format: "- Source Name"
+                        source = line[1:].strip()
+                        sources.append(source)
+                
+                proc.wait()
+            finally:
+                killer.cancel()
             
-            # Look for numbered list items
-            if line[0].isdigit() and '. ' in line:
-                # Extract source name (everything after "N. ")
-                source = line.split('. ', 1)[1] if '. ' in line else line
-                sources.append(source)
-                in_sources_list = True
-            elif in_sources_list and line.startswith('-'):
-                # Alternative format: "- Source Name"
-                source = line[1:].strip()
-                sources.append(source)
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(proc.args, timeout_seconds + 5)
         
         return sources
         
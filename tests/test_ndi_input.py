@@ -18,7 +18,10 @@ import time
 import subprocess
 import signal
 import argparse
+import functools
 import re
+import selectors
+import shutil
 from pathlib import Path
 from typing import Optional, List, Dict
 
@@ -29,6 +32,33 @@ except ImportError:
     MTC_AVAILABLE = False
     MTCHelper = None
 
+# Periodic statistics line, e.g. "NDI: 1000 frames, 2 dropped, avg capture: 33.3ms"
+_RE_STATS = re.compile(r'(\d+)\s+frames,\s*(\d+)\s+dropped')
+# Words _handle_line reacts to; lines are split with _RE_WORD
+_INTEREST = frozenset({'frames', 'dropped', 'connected', 'format', 'resolution', 'error', 'failed'})
+_RE_WORD = re.compile(r'[a-z]+')
+# Longer output lines are truncated before parsing
+_MAX_LINE_LENGTH = 4096
+# Discovery listing entry, e.g. "1. DESKTOP-ABC (NDI Test Patterns)"
+_RE_DISCOVERY = re.compile(r'^\d+\.\s(.+)$')
+
+_WRAPPER = Path(__file__).parent.parent / "scripts" / "cuems-videocomposer-wrapper.sh"
+
+@functools.lru_cache(maxsize=1)
+def _find_videocomposer_cached() -> Path:
+    """Find videocomposer wrapper script, falling back to an installed binary on PATH."""
+    if os.access(_WRAPPER, os.X_OK):
+        return _WRAPPER
+    
+    installed = shutil.which("cuems-videocomposer")
+    if installed:
+        return Path(installed)
+    
+    raise FileNotFoundError(
+        "videocomposer not found. Build the application first.\n"
+        f"  Checked: {_WRAPPER} and cuems-videocomposer on PATH"
+    )
+
 class NDITest:
     def __init__(self, videocomposer_bin: Optional[Path] = None, 
                  source: Optional[str] = None,
@@ -36,7 +66,7 @@ class NDITest:
                  verbose: bool = False,
                  use_mtc: bool = False,
                  use_osc: bool = False):
-        self.videocomposer_bin = videocomposer_bin or self._find_videocomposer()
+        self.videocomposer_bin = videocomposer_bin or _find_videocomposer_cached()
         self.source = source
         self.duration = duration
         self.verbose = verbose
@@ -55,23 +85,6 @@ class NDITest:
         # Set up signal handler
         signal.signal(signal.SIGINT, self._signal_handler)
     
-    def _find_videocomposer(self) -> Path:
-        """Find videocomposer wrapper script."""
-        possible_paths = [
-            Path(__file__).parent.parent / "scripts" / "cuems-videocomposer-wrapper.sh",
-            Path("/usr/bin/cuems-videocomposer"),
-            Path("/usr/local/bin/cuems-videocomposer"),
-        ]
-        
-        for path in possible_paths:
-            if path.exists() and os.access(path, os.X_OK):
-                return path
-        
-        raise FileNotFoundError(
-            "videocomposer not found. Build the application first.\n"
-            f"  Checked: {[str(p) for p in possible_paths]}"
-        )
-    
     def _signal_handler(self, signum, frame):
         """Handle Ctrl-C gracefully."""
         print("\n\nInterrupted by user. Cleaning up...")
@@ -90,7 +103,6 @@ class NDITest:
         except ImportError:
             # Fallback: call videocomposer directly
             try:
-                import subprocess
                 result = subprocess.run(
                     [str(self.videocomposer_bin), "--discover-ndi", "5"],
                     capture_output=True,
@@ -100,10 +112,9 @@ class NDITest:
                 
                 sources = []
                 for line in result.stdout.split('\n'):
-                    line = line.strip()
-                    if line and line[0].isdigit() and '. ' in line:
-                        source = line.split('. ', 1)[1]
-                        sources.append(source)
+                    match = _RE_DISCOVERY.match(line.strip())
+                    if match:
+                        sources.append(match.group(1))
                 
                 return sources
             except Exception as e:
@@ -125,12 +136,12 @@ class NDITest:
         print(f"Videocomposer: {self.videocomposer_bin}")
         print()
         
-        # Start MTC if requested
+        # Open the MTC port if requested; playback is started once
+        # videocomposer is launching, so the two overlap
         if self.use_mtc:
             print("Starting MTC timecode...")
             self.mtc_helper = MTCHelper(fps=25.0, port=0, portname="NDITest")
-            self.mtc_helper.start()
-            time.sleep(0.5)
+            self.mtc_helper.setup()
         
         # Build command
         cmd = [str(self.videocomposer_bin)]
@@ -154,59 +165,50 @@ class NDITest:
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1
+                bufsize=0
             )
             
-            start_time = time.time()
-            self.stats['connection_time'] = start_time
+            if self.mtc_helper:
+                self.mtc_helper.start()
+            
+            self.stats['connection_time'] = time.time()
+            # The deadline uses the monotonic clock so clock steps can't skew it
+            start_mono = time.monotonic()
             
             # Monitor output
             print("Monitoring videocomposer output...")
             print("-" * 60)
             
-            for line in self.process.stdout:
-                if self.verbose:
-                    print(line.rstrip())
-                
-                # Parse NDI-specific messages
-                if "NDI:" in line or "ndi" in line.lower():
-                    print(f"  {line.rstrip()}")
+            # Read the pipe without blocking so the duration deadline is
+            # enforced even when the NDI source goes quiet.
+            fd = self.process.stdout.fileno()
+            os.set_blocking(fd, False)
+            sel = selectors.DefaultSelector()
+            sel.register(fd, selectors.EVENT_READ)
+            pending = b''
+            try:
+                while True:
+                    remaining = self.duration - (time.monotonic() - start_mono)
+                    if remaining <= 0:
+                        print(f"\nTest duration ({self.duration}s) reached.")
+                        break
                     
-                    # Extract statistics
-                    if "frames" in line.lower() and "dropped" in line.lower():
-                        # Parse: "NDI: 1000 frames, 2 dropped, avg capture: 33.3ms"
-                        match = re.search(r'(\d+)\s+frames', line)
-                        if match:
-                            self.stats['frames_captured'] = int(match.group(1))
-                        
-                        match = re.search(r'(\d+)\s+dropped', line)
-                        if match:
-                            self.stats['frames_dropped'] = int(match.group(1))
+                    if not sel.select(timeout=min(remaining, 0.5)):
+                        continue
                     
-                    if "connected" in line.lower():
-                        self.stats['connection_time'] = time.time()
-                        print(f"  ✓ Connected to NDI source")
+                    chunk = os.read(fd, 65536)
+                    if not chunk:
+                        # EOF: process died
+                        if pending:
+                            self._handle_raw_line(pending)
+                        break
                     
-                    if "format:" in line.lower() or "resolution" in line.lower():
-                        print(f"  ✓ Format detected")
-                        if not self.stats['first_frame_time']:
-                            self.stats['first_frame_time'] = time.time()
-                
-                # Check for errors
-                if "error" in line.lower() or "failed" in line.lower():
-                    if "ndi" in line.lower():
-                        print(f"  ✗ ERROR: {line.rstrip()}")
-                        self.stats['capture_errors'] += 1
-                
-                # Check if process died
-                if self.process.poll() is not None:
-                    break
-                
-                # Check timeout
-                if time.time() - start_time >= self.duration:
-                    print(f"\nTest duration ({self.duration}s) reached.")
-                    break
+                    lines = (pending + chunk).split(b'\n')
+                    pending = lines.pop()
+                    for raw in lines:
+                        self._handle_raw_line(raw)
+            finally:
+                sel.close()
             
             # Wait for process to finish
             return_code = self.process.wait(timeout=5)
@@ -231,6 +233,53 @@ class NDITest:
         finally:
             self.cleanup()
     
+    def _handle_raw_line(self, raw: bytes):
+        """Filter one undecoded output line and pass it on to _handle_line."""
+        raw = raw[:_MAX_LINE_LENGTH]
+        # Unless everything is printed, only NDI lines need decoding
+        if not self.verbose and b'ndi' not in raw.lower():
+            return
+        self._handle_line(raw.decode('utf-8', errors='replace'))
+    
+    def _handle_line(self, line: str):
+        """Parse one line of videocomposer output."""
+        if self.verbose:
+            print(line.rstrip())
+        
+        line_lower = line.lower()
+        
+        # Only NDI-related lines are parsed ("NDI:" lines included)
+        if "ndi" not in line_lower:
+            return
+        
+        print(f"  {line.rstrip()}")
+        
+        words = _INTEREST.intersection(_RE_WORD.findall(line_lower))
+        if not words:
+            return
+        
+        # Extract statistics
+        if "frames" in words and "dropped" in words:
+            # Parse: "NDI: 1000 frames, 2 dropped, avg capture: 33.3ms"
+            match = _RE_STATS.search(line)
+            if match:
+                self.stats['frames_captured'] = int(match.group(1))
+                self.stats['frames_dropped'] = int(match.group(2))
+        
+        if "connected" in words:
+            self.stats['connection_time'] = time.time()
+            print(f"  ✓ Connected to NDI source")
+        
+        if "format" in words or "resolution" in words:
+            print(f"  ✓ Format detected")
+            if not self.stats['first_frame_time']:
+                self.stats['first_frame_time'] = time.time()
+        
+        # Check for errors
+        if "error" in words or "failed" in words:
+            print(f"  ✗ ERROR: {line.rstrip()}")
+            self.stats['capture_errors'] += 1
+    
     def _print_stats(self):
         """Print test statistics."""
         print(f"Connection time: {self.stats['connection_time']:.2f}s")
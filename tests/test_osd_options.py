@@ -6,60 +6,16 @@ Tests all OSD modes: SMPTE, FRAME, TEXT, BOX, MSG
 
 import subprocess
 import time
-import socket
 import sys
 from pathlib import Path
 
-def send_osc_command(port: int, path: str, value: int):
-    """Send OSC command with integer argument."""
-    try:
-        # Path
-        path_bytes = path.encode('utf-8') + b'\0'
-        path_padded = path_bytes + b'\0' * ((4 - len(path_bytes) % 4) % 4)
-        
-        # Type tag (',i' for integer)
-        type_tag = b',i\0'
-        type_tag_padded = type_tag + b'\0' * ((4 - len(type_tag) % 4) % 4)
-        
-        # Integer value (4 bytes, big-endian)
-        value_bytes = value.to_bytes(4, byteorder='big')
-        
-        # Combine message
-        osc_msg = path_padded + type_tag_padded + value_bytes
-        
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.sendto(osc_msg, ('127.0.0.1', port))
-        sock.close()
-    except Exception as e:
-        print(f"    Warning: Failed to send OSC command: {e}")
-
-def send_osc_string_command(port: int, path: str, string_value: str):
-    """Send OSC command with string argument."""
-    try:
-        # Path
-        path_bytes = path.encode('utf-8') + b'\0'
-        path_padded = path_bytes + b'\0' * ((4 - len(path_bytes) % 4) % 4)
-        
-        # Type tag (',s' for string)
-        type_tag = b',s\0'
-        type_tag_padded = type_tag + b'\0' * ((4 - len(type_tag) % 4) % 4)
-        
-        # String value (null-terminated, padded to 4-byte boundary)
-        string_bytes = string_value.encode('utf-8') + b'\0'
-        string_padded = string_bytes + b'\0' * ((4 - len(string_bytes) % 4) % 4)
-        
-        # Combine message
-        osc_msg = path_padded + type_tag_padded + string_padded
-        
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.sendto(osc_msg, ('127.0.0.1', port))
-        sock.close()
-    except Exception as e:
-        print(f"    Warning: Failed to send OSC string command: {e}")
+from osc_client import OscClient
+from output_pump import OutputPump, ProcessExitedError, spawn
 
 def test_osd_options(video_path: Path, videocomposer_bin: Path):
     """Test all OSD options."""
     osc_port = 7000
+    osc = OscClient(osc_port)
     
     cmd = [
         str(videocomposer_bin),
@@ -75,49 +31,49 @@ def test_osd_options(video_path: Path, videocomposer_bin: Path):
     process = None
     try:
         print(f"  Starting videocomposer with video: {video_path.name}")
-        process = subprocess.Popen(
+        process = spawn(
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1
+            bufsize=0
         )
+        pump = OutputPump(process)
         
         # Wait for startup
-        time.sleep(2)
+        pump.wait(2)
         
         print("\n  Test 1: SMPTE timecode at 89% (should have black box by default)")
-        send_osc_string_command(osc_port, "/videocomposer/osd/smpte", "89")
-        time.sleep(3)
+        osc.send_string("/videocomposer/osd/smpte", "89")
+        pump.wait(3)
         
         print("\n  Test 2: Frame number at 95%")
-        send_osc_command(osc_port, "/videocomposer/osd/frame", 95)
-        time.sleep(3)
+        osc.send_int("/videocomposer/osd/frame", 95)
+        pump.wait(3)
         
         print("\n  Test 3: Custom text 'TEST TEXT' at center (direct OSC)")
-        send_osc_string_command(osc_port, "/videocomposer/osd/text", "TEST TEXT")
-        time.sleep(3)
+        osc.send_string("/videocomposer/osd/text", "TEST TEXT")
+        pump.wait(3)
         
         print("\n  Test 4: Toggle BOX off (transparent background)")
-        send_osc_command(osc_port, "/videocomposer/osd/box", 0)
-        time.sleep(3)
+        osc.send_int("/videocomposer/osd/box", 0)
+        pump.wait(3)
         
         print("\n  Test 5: Toggle BOX on (black background)")
-        send_osc_command(osc_port, "/videocomposer/osd/box", 1)
-        time.sleep(3)
+        osc.send_int("/videocomposer/osd/box", 1)
+        pump.wait(3)
         
         print("\n  Test 6: Disable SMPTE, keep FRAME")
-        send_osc_string_command(osc_port, "/videocomposer/cmd", "osd smpte -1")
-        time.sleep(3)
+        osc.send_string("/videocomposer/cmd", "osd smpte -1")
+        pump.wait(3)
         
         print("\n  Test 7: Disable FRAME, enable SMPTE")
-        send_osc_string_command(osc_port, "/videocomposer/cmd", "osd frame -1")
-        send_osc_string_command(osc_port, "/videocomposer/osd/smpte", "89")
-        time.sleep(3)
+        osc.send_string("/videocomposer/cmd", "osd frame -1")
+        osc.send_string("/videocomposer/osd/smpte", "89")
+        pump.wait(3)
         
         print("\n  Test 8: Clear text")
-        send_osc_string_command(osc_port, "/videocomposer/cmd", "osd notext")
-        time.sleep(2)
+        osc.send_string("/videocomposer/cmd", "osd notext")
+        pump.wait(2)
         
         print("\n  All OSD tests completed!")
         print("  Please verify visually:")
@@ -126,18 +82,21 @@ def test_osd_options(video_path: Path, videocomposer_bin: Path):
         print("    - Custom text 'TEST TEXT' at center")
         print("    - BOX toggle (transparent/black)")
         
+    except ProcessExitedError as e:
+        print(f"\n  Error: {e}")
     except KeyboardInterrupt:
         print("\n  Test interrupted by user")
     finally:
         if process:
             print("\n  Terminating videocomposer...")
-            send_osc_command(osc_port, "/videocomposer/quit", 0)
+            osc.send_int("/videocomposer/quit", 0)
             time.sleep(1)
             process.terminate()
             try:
                 process.wait(timeout=5)
             except subprocess.TimeoutExpired:
                 process.kill()
+        osc.close()
 
 if __name__ == "__main__":
     script_dir = Path(__file__).parent
@@ -13,15 +13,21 @@ import subprocess
 import time
 import sys
 import os
+import socket
+import stat
+import threading
 from pathlib import Path
 import argparse
 
 try:
-    import pythonosc.udp_client
+    import pythonosc.osc_bundle_builder
+    import pythonosc.osc_message_builder
 except ImportError:
     print("ERROR: python-osc not installed. Install with: pip install python-osc")
     sys.exit(1)
 
+from output_pump import wait_for_osc_port
+
 try:
     from mtc_helper import MTCHelper, MTC_AVAILABLE
 except ImportError:
@@ -29,23 +35,55 @@ except ImportError:
     MTC_AVAILABLE = False
     MTCHelper = None
 
+# Batched messages are split into bundles of at most this many bytes so a
+# bundle fits in one unfragmented UDP datagram
+_MAX_BUNDLE_SIZE = 1400
+# "#bundle\0" + 8-byte timetag
+_BUNDLE_HEADER_SIZE = 16
+# Requested OSC send buffer; the kernel caps it at net.core.wmem_max
+_OSC_SNDBUF = 4 << 20
+
+# Resolved videocomposer path per --videocomposer argument
+_VIDEOCOMPOSER_CACHE = {}
+
+# Longest time to wait for videocomposer to open its OSC port at startup
+_STARTUP_TIMEOUT = 2.0
+
 
 class ResolutionModesTest:
-    def __init__(self, videocomposer_bin=None, video_file=None, osc_port=7770, fps=25.0, mtc_port=0):
+    __slots__ = (
+        'videocomposer_bin', 'video_file', 'osc_port', 'fps', 'mtc_port',
+        'videocomposer_process', 'osc_sock', 'mtc_helper', 'quiet',
+        '_batch', '_batch_size',
+    )
+    
+    def __init__(self, videocomposer_bin=None, video_file=None, osc_port=7770, fps=25.0, mtc_port=0,
+                 quiet=False):
         self.videocomposer_bin = self._find_videocomposer(videocomposer_bin)
         self.video_file = video_file
         self.osc_port = osc_port
         self.fps = fps
         self.mtc_port = mtc_port
         self.videocomposer_process = None
-        self.osc_client = None
+        self.osc_sock = None
         self.mtc_helper = None
+        self.quiet = quiet  # Don't echo each OSC message
+        self._batch = None  # Queued OscMessages between begin_batch() and flush_batch()
+        self._batch_size = 0
         
         if MTC_AVAILABLE:
             self.mtc_helper = MTCHelper(fps=fps, port=mtc_port, portname="ResolutionTest")
     
     def _find_videocomposer(self, provided_path=None):
-        """Find videocomposer binary or wrapper script."""
+        """Find videocomposer binary or wrapper script (cached per process)."""
+        path = _VIDEOCOMPOSER_CACHE.get(provided_path)
+        if path is None:
+            path = _VIDEOCOMPOSER_CACHE[provided_path] = self._locate_videocomposer(provided_path)
+        return path
+    
+    @staticmethod
+    def _locate_videocomposer(provided_path):
+        """Search for videocomposer, stat()ing each candidate once."""
         if provided_path:
             path = Path(provided_path)
             if path.exists():
@@ -65,19 +103,28 @@ class ResolutionModesTest:
         ]
         
         for path in possible_paths:
-            if path.exists():
-                # Check if executable (for scripts) or is a file (for binaries)
-                if path.is_file() and (os.access(path, os.X_OK) or path.suffix == ''):
-                    print(f"Found videocomposer: {path}")
-                    return path
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            # Check if executable (for scripts) or is a file (for binaries)
+            if stat.S_ISREG(st.st_mode) and (st.st_mode & 0o111 or path.suffix == ''):
+                print(f"Found videocomposer: {path}")
+                return path
         
         raise FileNotFoundError(
             "videocomposer not found. Build the application first.\n"
             f"  Checked: {[str(p) for p in possible_paths]}"
         )
     
-    def start_videocomposer(self):
-        """Start videocomposer process."""
+    def start_videocomposer(self, on_spawn=None):
+        """
+        Start videocomposer process.
+        
+        Args:
+            on_spawn: Optional callable run right after the process is spawned,
+                      so its work overlaps with the startup wait
+        """
         if not self.videocomposer_bin.exists():
             print(f"ERROR: videocomposer binary not found: {self.videocomposer_bin}")
             return False
@@ -101,7 +148,10 @@ class ResolutionModesTest:
             text=True,
             env=env
         )
-        time.sleep(2)
+        if on_spawn:
+            on_spawn()
+        
+        wait_for_osc_port(self.videocomposer_process, self.osc_port, _STARTUP_TIMEOUT)
         
         if self.videocomposer_process.poll() is not None:
             print("ERROR: videocomposer exited immediately")
@@ -113,27 +163,94 @@ class ResolutionModesTest:
     def connect_osc(self):
         """Connect OSC client."""
         try:
-            self.osc_client = pythonosc.udp_client.SimpleUDPClient("127.0.0.1", self.osc_port)
-            print(f"OSC client connected to port {self.osc_port}")
+            self.osc_sock = sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, _OSC_SNDBUF)
+            sndbuf = sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF)
+            # Pin the destination so messages go out with send() on a connected
+            # socket (see _send) instead of sendto() resolving the address each time
+            sock.connect(("127.0.0.1", self.osc_port))
+            print(f"OSC client connected to port {self.osc_port} (send buffer: {sndbuf // 1024} KiB)")
+            if sndbuf < _OSC_SNDBUF:
+                print(f"  NOTE: send buffer limited by net.core.wmem_max (requested {_OSC_SNDBUF // 1024} KiB)")
             return True
         except Exception as e:
             print(f"ERROR: Failed to connect OSC client: {e}")
             return False
     
     def send_osc(self, path, *args):
-        """Send OSC message."""
-        if not self.osc_client:
+        """Send OSC message, or queue it if a batch is open (see begin_batch)."""
+        if not self.osc_sock:
             print("ERROR: OSC client not connected")
             return False
         
         try:
-            self.osc_client.send_message(path, list(args))
-            print(f"  → {path} {list(args)}")
+            builder = pythonosc.osc_message_builder.OscMessageBuilder(address=path)
+            for arg in args:
+                builder.add_arg(arg)
+            msg = builder.build()
+            
+            if self._batch is None:
+                self._send(msg)
+            else:
+                # Each bundle element is prefixed with its int32 size
+                if self._batch and self._batch_size + 4 + msg.size > _MAX_BUNDLE_SIZE:
+                    self._send_batch()
+                self._batch.append(msg)
+                self._batch_size += 4 + msg.size
+            if not self.quiet:
+                print(f"  → {path} {list(args)}")
             return True
         except Exception as e:
             print(f"ERROR: Failed to send OSC message: {e}")
             return False
     
+    def _send(self, content):
+        """Send an OscMessage or OscBundle on the connected socket."""
+        self.osc_sock.send(content.dgram)
+    
+    def begin_batch(self):
+        """Queue subsequent send_osc() messages until flush_batch()."""
+        self._batch = []
+        self._batch_size = _BUNDLE_HEADER_SIZE
+    
+    def _send_batch(self):
+        """Send the queued messages as one OSC bundle and empty the queue."""
+        builder = pythonosc.osc_bundle_builder.OscBundleBuilder(
+            pythonosc.osc_bundle_builder.IMMEDIATELY)
+        for msg in self._batch:
+            builder.add_content(msg)
+        self._send(builder.build())
+        self._batch = []
+        self._batch_size = _BUNDLE_HEADER_SIZE
+    
+    def flush_batch(self):
+        """Send the messages queued since begin_batch() and stop batching."""
+        try:
+            if self._batch:
+                self._send_batch()
+            return True
+        except Exception as e:
+            print(f"ERROR: Failed to send OSC bundle: {e}")
+            return False
+        finally:
+            self._batch = None
+    
+    def wait_running(self, seconds):
+        """
+        Wait for the given time while videocomposer keeps running.
+        
+        videocomposer sends no OSC replies, so there is nothing to wait on
+        after a command; this at least ends the wait as soon as it exits.
+        
+        Raises:
+            RuntimeError: if videocomposer exits during the wait
+        """
+        try:
+            returncode = self.videocomposer_process.wait(timeout=seconds)
+        except subprocess.TimeoutExpired:
+            return
+        raise RuntimeError(f"videocomposer exited with code {returncode}")
+    
     def cleanup(self):
         """Cleanup resources."""
         if self.mtc_helper:
@@ -145,6 +262,9 @@ class ResolutionModesTest:
                 self.videocomposer_process.wait(timeout=5)
             except subprocess.TimeoutExpired:
                 self.videocomposer_process.kill()
+        if self.osc_sock:
+            self.osc_sock.close()
+            self.osc_sock = None
     
     def run_tests(self):
         """Run on-the-fly resolution change test during video playback."""
@@ -157,19 +277,36 @@ class ResolutionModesTest:
             print("  Usage: ./test_resolution_modes.py --video <path/to/video.mp4>")
             return False
         
-        if not self.start_videocomposer():
+        if not MTC_AVAILABLE or not self.mtc_helper:
+            print("ERROR: MTC helper required for video playback test")
             return False
         
-        if not self.connect_osc():
-            self.cleanup()
+        # Importing mtcsender chdirs the whole process, so it is done here on
+        # the main thread; the background thread below only opens the port
+        if not self.mtc_helper.preload():
+            print("ERROR: MTC setup failed")
             return False
         
-        if not MTC_AVAILABLE or not self.mtc_helper:
-            print("ERROR: MTC helper required for video playback test")
+        # Opening the MTC port doesn't depend on videocomposer, so it runs while
+        # videocomposer starts up
+        mtc_ready = threading.Event()
+        
+        def setup_mtc():
+            if self.mtc_helper.setup():
+                mtc_ready.set()
+        
+        mtc_thread = threading.Thread(target=setup_mtc, daemon=True)
+        started = self.start_videocomposer(on_spawn=mtc_thread.start)
+        
+        # on_spawn never runs if videocomposer could not be spawned
+        if mtc_thread.ident is not None:
+            mtc_thread.join()
+        
+        if not started or not self.connect_osc():
             self.cleanup()
             return False
         
-        if not self.mtc_helper.setup():
+        if not mtc_ready.is_set():
             print("ERROR: MTC setup failed")
             self.cleanup()
             return False
@@ -180,24 +317,26 @@ class ResolutionModesTest:
             # Load video
             print("\n[1] Loading video file...")
             self.send_osc("/videocomposer/layer/load", self.video_file, "test_video")
-            time.sleep(1)
+            self.wait_running(1)
             
             # Enable mtcfollow
             print("\n[2] Enabling mtcfollow...")
             self.send_osc("/videocomposer/layer/test_video/mtcfollow", "1")
-            time.sleep(0.5)
+            self.wait_running(0.5)
             
             # Position layer to be visible
             print("\n[3] Positioning layer on canvas...")
+            self.begin_batch()
             self.send_osc("/videocomposer/layer/test_video/position", "960", "540")  # Center
             self.send_osc("/videocomposer/layer/test_video/scale", "1.0", "1.0")
-            time.sleep(0.5)
+            self.flush_batch()
+            self.wait_running(0.5)
             
             # Start MTC and let video play for a bit
             print("\n[4] Starting MTC timecode...")
             self.mtc_helper.start(0)
             print("  → Video should now be playing")
-            time.sleep(5)  # Let video play for 5 seconds to establish playback
+            self.wait_running(5)  # Let video play for 5 seconds to establish playback
             
             # Now test resolution changes while video is actively playing
             print("\n[5] Testing resolution changes DURING playback...")
@@ -215,24 +354,28 @@ class ResolutionModesTest:
                 (1920, 1080, 60, "1080p (restore)"),
             ]
             
-            for output in outputs_to_test:
-                print(f"\n    Testing {output}:")
-                for width, height, refresh, desc in resolution_sequence:
-                    print(f"      → Changing to {desc} ({width}x{height}@{refresh}Hz)...")
+            # Outputs are independent, so each step changes all of them in one
+            # bundle and shares one wait; steps on the same output stay sequential
+            print(f"\n    Testing {', '.join(outputs_to_test)}:")
+            for width, height, refresh, desc in resolution_sequence:
+                print(f"      → Changing to {desc} ({width}x{height}@{refresh}Hz)...")
+                self.begin_batch()
+                for output in outputs_to_test:
                     self.send_osc("/videocomposer/display/mode", output, str(width), str(height), str(refresh))
-                    print(f"        Waiting 4 seconds...")
-                    time.sleep(4)
-                print(f"      Done testing {output}")
+                self.flush_batch()
+                print(f"        Waiting 4 seconds...")
+                self.wait_running(4)
+            print(f"      Done testing {', '.join(outputs_to_test)}")
             
             # Final verification: video should still be playing
             print("\n[7] Final verification...")
             print("     Video should have been playing continuously through all resolution changes")
-            time.sleep(3)
+            self.wait_running(3)
             
             if self.mtc_helper:
                 print("\nStopping MTC...")
                 self.mtc_helper.stop()
-                time.sleep(1)
+                self.wait_running(1)
             
             print("\n" + "=" * 70)
             print("✓ Test completed!")
@@ -260,6 +403,7 @@ def main():
     parser.add_argument("--osc-port", type=int, default=7770, help="OSC port (default: 7770)")
     parser.add_argument("--fps", type=float, default=25.0, help="MTC framerate (default: 25.0)")
     parser.add_argument("--mtc-port", type=int, default=0, help="MTC MIDI port (default: 0)")
+    parser.add_argument("--quiet", action="store_true", help="Don't echo each OSC message sent")
     
     args = parser.parse_args()
     
@@ -269,7 +413,8 @@ def main():
             video_file=args.video,
             osc_port=args.osc_port,
             fps=args.fps,
-            mtc_port=args.mtc_port
+            mtc_port=args.mtc_port,
+            quiet=args.quiet
         )
     except FileNotFoundError as e:
         print(f"ERROR: {e}")
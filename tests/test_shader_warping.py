@@ -9,133 +9,317 @@ This test verifies:
 4. Shaders work with different video formats
 """
 
+import socket
 import subprocess
 import time
 import argparse
+import functools
+import struct
+from contextlib import contextmanager
 from pathlib import Path
-from pythonosc import udp_client
+from pythonosc import osc_bundle_builder, osc_message, osc_message_builder
+
+from output_pump import wait_for_osc_port
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+_PROJECT_ROOT = _SCRIPT_DIR.parent
+_WRAPPER = _PROJECT_ROOT / "scripts" / "cuems-videocomposer-wrapper.sh"
+
+# Print every OSC message sent (--debug)
+DEBUG = False
+
+# With --ci the visual-inspection pauses shrink to a short settle time
+CI = False
+_CI_SETTLE = 0.5
+
+# Numeric address for videocomposer, resolved once at import
+_LOCAL = socket.gethostbyname("localhost")
+
+# One connected UDP socket per (address, port), reused by every send
+_SOCKETS = {}
+
+# Upper bound for videocomposer to bind its OSC port after launch
+_STARTUP_TIMEOUT = 2.0
+
+def _get_socket(address, port):
+    """Return the cached UDP socket connected to address:port, creating it once
+    
+    A connected socket sends with send() and lets the kernel keep the route,
+    instead of looking up the destination on every sendto().
+    """
+    sock = _SOCKETS.get((address, port))
+    if sock is None:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.connect((address, port))
+        _SOCKETS[(address, port)] = sock
+    return sock
+
+def _build_message(path, args):
+    """Encode one OSC message (args must already be int, float or str)"""
+    msg = osc_message_builder.OscMessageBuilder(address=path)
+    for arg in args:
+        msg.add_arg(arg)
+    return msg.build()
+
+# Corner-deform warps as 12 floats, independent of the layer they go to
+WARPS = {
+    # Subtle keystone correction (~10°)
+    "subtle": (
+        0.0, -0.1, 0.0,   # Corner 0: (x, y) offset
+        0.0, 0.0, -0.1,   # Corner 1
+        0.0, 0.0, 0.1,    # Corner 2
+        0.0, 0.1, 0.0),   # Corner 3
+    # More pronounced warp (~20°)
+    "moderate": (
+        0.0, -0.2, 0.0,
+        0.0, 0.0, -0.2,
+        0.0, 0.0, 0.2,
+        0.0, 0.2, 0.0),
+    # Extreme warp (>30°)
+    "extreme": (
+        0.0, -0.4, 0.0,
+        0.0, -0.2, -0.4,
+        0.0, 0.2, 0.4,
+        0.0, 0.4, 0.2),
+    # Top narrower than bottom
+    "trapezoid": (
+        0.0, -0.3, -0.2,
+        0.0, 0.3, -0.2,
+        0.0, 0.4, 0.3,
+        0.0, -0.4, 0.3),
+    # Multi-layer test: keystone for the base layer, stronger warp for the overlay
+    "keystone": (
+        0.0, -0.1, 0.0,
+        0.0, 0.1, 0.0,
+        0.0, 0.1, 0.1,
+        0.0, -0.1, 0.1),
+    "overlay": (
+        0.0, -0.25, -0.1,
+        0.0, 0.25, -0.1,
+        0.0, 0.2, 0.2,
+        0.0, -0.2, 0.2),
+}
+
+_WARP_STRUCT = struct.Struct(">12f")
+
+@functools.lru_cache(maxsize=None)
+def _corner_deform_prefix(layer):
+    """Encoded address + type tag of a layer's corner_deform message"""
+    return _build_message(f"/videocomposer/layer/{layer}/corner_deform",
+                          (0.0,) * 12).dgram[:-_WARP_STRUCT.size]
+
+def encode_warp(layer, warp):
+    """Encode a corner_deform message for layer; warp is any 12-float sequence"""
+    return _corner_deform_prefix(layer) + _WARP_STRUCT.pack(*warp)
+
+# The warps the tests send, encoded once at import so each step resends the
+# same message instead of re-encoding 12 floats
+CORNER_PRESETS = {
+    name: osc_message.OscMessage(encode_warp(layer, WARPS[warp]))
+    for name, (layer, warp) in {
+        "subtle": (0, "subtle"),
+        "moderate": (0, "moderate"),
+        "extreme": (0, "extreme"),
+        "trapezoid": (0, "trapezoid"),
+        "multi_keystone": (0, "keystone"),
+        "multi_overlay": (1, "overlay"),
+    }.items()
+}
+
+def send_raw(address, dgram, port=7700):
+    """Send an already encoded OSC datagram"""
+    try:
+        _get_socket(address, port).send(dgram)
+        return True
+    except Exception as e:
+        print(f"OSC error: {e}")
+        return False
+
+def send_warp(address, layer, warp, port=7700):
+    """Send an arbitrary warp (12 floats) to a layer's corner_deform"""
+    if DEBUG:
+        print(f"DEBUG OSC: /videocomposer/layer/{layer}/corner_deform -> warp")
+    return send_raw(address, encode_warp(layer, warp), port)
+
+def send_preset(address, name, port=7700):
+    """Send one of the CORNER_PRESETS"""
+    if DEBUG:
+        print(f"DEBUG OSC: {CORNER_PRESETS[name].address} -> preset {name}")
+    return send_raw(address, CORNER_PRESETS[name].dgram, port)
 
 def send_osc(address, path, *args, port=7700):
-    """Send OSC message to videocomposer using pythonosc"""
+    """Send OSC message to videocomposer, encoded with pythonosc
+    
+    args are passed through as-is; python-osc picks the OSC type from
+    int/float/str, so callers pass strings for string arguments.
+    """
     try:
-        client = udp_client.SimpleUDPClient(address, port)
-        # Convert all args to proper types (strings stay strings, numbers stay numbers)
-        osc_args = []
-        for arg in args:
-            if isinstance(arg, (int, float)):
-                osc_args.append(arg)
-            else:
-                osc_args.append(str(arg))
-        # Debug: print what we're sending
-        print(f"DEBUG OSC: {path} -> {osc_args}")
-        client.send_message(path, osc_args)
+        if DEBUG:
+            print(f"DEBUG OSC: {path} -> {args}")
+        _get_socket(address, port).send(_build_message(path, args).dgram)
         return True
     except Exception as e:
         print(f"OSC error: {e}")
         return False
 
-def test_corner_deformation(video_path, duration=30):
-    """Test corner deformation with various warp levels"""
+def send_osc_bundle(address, messages, port=7700):
+    """Send several OSC messages as one immediate bundle
     
-    print("\n" + "="*70)
-    print("SHADER-BASED CORNER DEFORMATION TEST")
-    print("="*70)
+    Each entry is either a (path, args) pair or an already built
+    OscMessage such as a CORNER_PRESETS value.
+    """
+    try:
+        bundle = osc_bundle_builder.OscBundleBuilder(osc_bundle_builder.IMMEDIATELY)
+        for entry in messages:
+            if isinstance(entry, osc_message.OscMessage):
+                if DEBUG:
+                    print(f"DEBUG OSC: {entry.address} -> preset")
+                bundle.add_content(entry)
+                continue
+            path, args = entry
+            if DEBUG:
+                print(f"DEBUG OSC: {path} -> {args}")
+            bundle.add_content(_build_message(path, args))
+        _get_socket(address, port).send(bundle.build().dgram)
+        return True
+    except Exception as e:
+        print(f"OSC error: {e}")
+        return False
+
+def hold(seconds):
+    """Pause so the current state can be inspected (only briefly with --ci)"""
+    time.sleep(_CI_SETTLE if CI else seconds)
+
+def stop_videocomposer(proc):
+    """Terminate videocomposer, escalating to kill() after 5 s
+    
+    The wrapper script execs the binary, so proc is videocomposer itself.
+    """
+    print("\nStopping videocomposer...")
+    proc.terminate()
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+@contextmanager
+def videocomposer_session(port=7700):
+    """
+    Run videocomposer for the duration of the with-block.
     
-    # Start videocomposer
-    print("\n[1/6] Starting videocomposer...")
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent
-    wrapper_script = project_root / "scripts" / "cuems-videocomposer-wrapper.sh"
+    Startup waits until the OSC port is bound (at most _STARTUP_TIMEOUT)
+    rather than a fixed sleep, so several tests can share one instance
+    without each paying for process and GL context startup.
+    """
+    print("\nStarting videocomposer...")
     proc = subprocess.Popen(
-        [str(wrapper_script), "--osc", "7700"],
-        cwd=str(project_root),
+        [_WRAPPER, "--osc", str(port)],
+        cwd=_PROJECT_ROOT,
         stdout=None,
         stderr=None
     )
     
-    time.sleep(2)  # Wait for startup
+    wait_for_osc_port(proc, port, _STARTUP_TIMEOUT)
+    
+    try:
+        yield proc
+    finally:
+        # OSC gets no replies, so a crash mid-test only shows up here
+        if proc.poll() is not None:
+            print(f"\nERROR: videocomposer exited early (code {proc.returncode})")
+        stop_videocomposer(proc)
+
+def reset_layers(cue_ids):
+    """Unload the given layers so the next test on a shared session starts clean
+    
+    Unloading drops each layer together with its corner warp and HQ
+    settings, so no warp state carries over into the next test.
+    """
+    print("\n[Reset] Unloading layers before the next test...")
+    send_osc_bundle(_LOCAL, [
+        ("/videocomposer/layer/unload", (cue_id,)) for cue_id in cue_ids
+    ])
+    time.sleep(1)
+
+def test_corner_deformation(video_path, duration=30):
+    """Test corner deformation with various warp levels (videocomposer must be running)"""
+    
+    print("\n" + "="*70)
+    print("SHADER-BASED CORNER DEFORMATION TEST")
+    print("="*70)
     
     try:
         # Load video on layer 0
         # OSC format: /videocomposer/layer/load ss (filepath, cueId)
-        print(f"\n[2/6] Loading video: {video_path}")
-        send_osc("localhost", "/videocomposer/layer/load", str(video_path), "0")
+        print(f"\n[1/5] Loading video: {video_path}")
+        send_osc(_LOCAL, "/videocomposer/layer/load", str(video_path), "0")
         time.sleep(1)
         
         # Make layer visible and start playback
         # Layer commands use pattern: /videocomposer/layer/<id>/<command>
         # NOTE: Video will only play when MTC timecode is running
-        send_osc("localhost", "/videocomposer/layer/0/visible", 1)
-        send_osc("localhost", "/videocomposer/layer/0/play")
+        send_osc_bundle(_LOCAL, [
+            ("/videocomposer/layer/0/visible", (1,)),
+            ("/videocomposer/layer/0/play", ()),
+        ])
         
-        print("\n[3/6] Testing standard rendering (no warp)...")
+        print("\n[2/5] Testing standard rendering (no warp)...")
         print("  → Video should display normally")
         print("  → Check that shader rendering works")
-        time.sleep(5)
+        hold(5)
         
         # Test 1: Subtle keystone correction (~10° warp)
-        print("\n[4/6] Testing subtle warp (keystone correction)...")
+        print("\n[3/5] Testing subtle warp (keystone correction)...")
         print("  → Applying ~10° perspective correction")
         print("  → Should use standard quality shader")
         
         # Top-left corner: pull inward slightly
         # Layer commands use pattern: /videocomposer/layer/<id>/<command>
-        send_osc("localhost", "/videocomposer/layer/0/corner_deform", 
-                0.0, -0.1, 0.0,   # Corner 0: (x, y) offset
-                0.0, 0.0, -0.1,   # Corner 1
-                0.0, 0.0, 0.1,    # Corner 2
-                0.0, 0.1, 0.0)    # Corner 3
-        send_osc("localhost", "/videocomposer/layer/0/corner_deform_enable", 1)
+        send_osc_bundle(_LOCAL, [
+            CORNER_PRESETS["subtle"],
+            ("/videocomposer/layer/0/corner_deform_enable", (1,)),
+        ])
         
-        time.sleep(5)
+        hold(5)
         
         # Test 2: Moderate warp (~20° warp)
-        print("\n[5/6] Testing moderate warp...")
+        print("\n[4/5] Testing moderate warp...")
         print("  → Applying ~20° perspective warp")
         
-        send_osc("localhost", "/videocomposer/layer/0/corner_deform",
-                0.0, -0.2, 0.0,   # More pronounced warp
-                0.0, 0.0, -0.2,
-                0.0, 0.0, 0.2,
-                0.0, 0.2, 0.0)
+        send_preset(_LOCAL, "moderate")
         
-        time.sleep(5)
+        hold(5)
         
         # Test 3: Extreme warp with high-quality mode
-        print("\n[6/6] Testing extreme warp (high-quality mode)...")
+        print("\n[5/5] Testing extreme warp (high-quality mode)...")
         print("  → Applying >30° projection mapping warp")
         print("  → Enabling high-quality anisotropic filtering")
         
-        # Enable high-quality mode
-        send_osc("localhost", "/videocomposer/layer/0/corner_deform_hq", 1)
+        # Enable high-quality mode and apply extreme warp
+        send_osc_bundle(_LOCAL, [
+            ("/videocomposer/layer/0/corner_deform_hq", (1,)),
+            CORNER_PRESETS["extreme"],
+        ])
         
-        # Extreme warp
-        send_osc("localhost", "/videocomposer/layer/0/corner_deform",
-                0.0, -0.4, 0.0,   # Extreme warp
-                0.0, -0.2, -0.4,
-                0.0, 0.2, 0.4,
-                0.0, 0.4, 0.2)
-        
-        time.sleep(5)
+        hold(5)
         
         # Test 4: Trapezoid (projection mapping scenario)
         print("\n[Bonus] Testing trapezoid warp (projector mapping)...")
         print("  → Simulating projection onto angled surface")
         
-        send_osc("localhost", "/videocomposer/layer/0/corner_deform",
-                0.0, -0.3, -0.2,  # Top narrower than bottom
-                0.0, 0.3, -0.2,
-                0.0, 0.4, 0.3,
-                0.0, -0.4, 0.3)
+        send_preset(_LOCAL, "trapezoid")
         
-        time.sleep(5)
+        hold(5)
         
         # Disable warping
         print("\n[Cleanup] Disabling warp, returning to normal...")
-        send_osc("localhost", "/videocomposer/layer/0/corner_deform_enable", 0)
-        send_osc("localhost", "/videocomposer/layer/0/corner_deform_hq", 0)
+        send_osc_bundle(_LOCAL, [
+            ("/videocomposer/layer/0/corner_deform_enable", (0,)),
+            ("/videocomposer/layer/0/corner_deform_hq", (0,)),
+        ])
         
-        time.sleep(3)
+        hold(3)
         
         print("\n" + "="*70)
         print("TEST COMPLETE")
@@ -151,72 +335,53 @@ def test_corner_deformation(video_path, duration=30):
         
     except KeyboardInterrupt:
         print("\n\nTest interrupted by user")
-    finally:
-        print("\nStopping videocomposer...")
-        proc.terminate()
-        proc.wait(timeout=5)
 
 def test_multi_layer_warping(video1, video2, duration=30):
-    """Test multiple layers with different warp settings"""
+    """Test multiple layers with different warp settings (videocomposer must be running)"""
     
     print("\n" + "="*70)
     print("MULTI-LAYER WARPING TEST")
     print("="*70)
     
-    print("\n[1/4] Starting videocomposer...")
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent
-    wrapper_script = project_root / "scripts" / "cuems-videocomposer-wrapper.sh"
-    proc = subprocess.Popen(
-        [str(wrapper_script), "--osc", "7700"],
-        cwd=str(project_root),
-        stdout=None,
-        stderr=None
-    )
-    
-    time.sleep(2)
-    
     try:
         # Load two videos
         # OSC format: /videocomposer/layer/load ss (filepath, cueId)
-        print(f"\n[2/4] Loading layer 0: {video1}")
-        send_osc("localhost", "/videocomposer/layer/load", str(video1), "0")
+        print(f"\n[1/3] Loading layer 0: {video1}")
+        send_osc(_LOCAL, "/videocomposer/layer/load", str(video1), "0")
         time.sleep(1)
         
-        print(f"[2/4] Loading layer 1: {video2}")
-        send_osc("localhost", "/videocomposer/layer/load", str(video2), "1")
+        print(f"[1/3] Loading layer 1: {video2}")
+        send_osc(_LOCAL, "/videocomposer/layer/load", str(video2), "1")
         time.sleep(1)
         
         # Setup layers
         # NOTE: Videos will only play when MTC timecode is running
-        send_osc("localhost", "/videocomposer/layer/0/visible", 1)
-        send_osc("localhost", "/videocomposer/layer/1/visible", 1)
-        send_osc("localhost", "/videocomposer/layer/1/opacity", 0.7)  # Semi-transparent overlay
-        send_osc("localhost", "/videocomposer/layer/0/play")
-        send_osc("localhost", "/videocomposer/layer/1/play")
+        send_osc_bundle(_LOCAL, [
+            ("/videocomposer/layer/0/visible", (1,)),
+            ("/videocomposer/layer/1/visible", (1,)),
+            ("/videocomposer/layer/1/opacity", (0.7,)),  # Semi-transparent overlay
+            ("/videocomposer/layer/0/play", ()),
+            ("/videocomposer/layer/1/play", ()),
+        ])
         
-        print("\n[3/4] Applying different warps to each layer...")
+        print("\n[2/3] Applying different warps to each layer...")
         
         # Layer 0: subtle warp
         print("  → Layer 0: Subtle keystone correction")
-        send_osc("localhost", "/videocomposer/layer/0/corner_deform",
-                0.0, -0.1, 0.0,
-                0.0, 0.1, 0.0,
-                0.0, 0.1, 0.1,
-                0.0, -0.1, 0.1)
-        send_osc("localhost", "/videocomposer/layer/0/corner_deform_enable", 1)
+        send_osc_bundle(_LOCAL, [
+            CORNER_PRESETS["multi_keystone"],
+            ("/videocomposer/layer/0/corner_deform_enable", (1,)),
+        ])
         
         # Layer 1: moderate warp with HQ
         print("  → Layer 1: Moderate warp with high-quality")
-        send_osc("localhost", "/videocomposer/layer/1/corner_deform",
-                0.0, -0.25, -0.1,
-                0.0, 0.25, -0.1,
-                0.0, 0.2, 0.2,
-                0.0, -0.2, 0.2)
-        send_osc("localhost", "/videocomposer/layer/1/corner_deform_enable", 1)
-        send_osc("localhost", "/videocomposer/layer/1/corner_deform_hq", 1)
+        send_osc_bundle(_LOCAL, [
+            CORNER_PRESETS["multi_overlay"],
+            ("/videocomposer/layer/1/corner_deform_enable", (1,)),
+            ("/videocomposer/layer/1/corner_deform_hq", (1,)),
+        ])
         
-        print(f"\n[4/4] Running for {duration} seconds...")
+        print(f"\n[3/3] Running for {duration} seconds...")
         print("  → Both layers should render warped simultaneously")
         print("  → Check for smooth playback and no corruption")
         
@@ -228,10 +393,6 @@ def test_multi_layer_warping(video1, video2, duration=30):
         
     except KeyboardInterrupt:
         print("\n\nTest interrupted by user")
-    finally:
-        print("\nStopping videocomposer...")
-        proc.terminate()
-        proc.wait(timeout=5)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Test shader-based corner deformation")
@@ -243,8 +404,14 @@ if __name__ == "__main__":
                        help="Test duration in seconds")
     parser.add_argument("--test", choices=["basic", "multi", "both"], default="basic",
                        help="Which test to run")
+    parser.add_argument("--debug", action="store_true",
+                       help="Print every OSC message sent")
+    parser.add_argument("--ci", action="store_true",
+                       help=f"Replace the visual-inspection pauses with a {_CI_SETTLE}s settle")
     
     args = parser.parse_args()
+    DEBUG = args.debug
+    CI = args.ci
     
     video_path = Path(args.video)
     if not video_path.exists():
@@ -255,21 +422,29 @@ if __name__ == "__main__":
     # Convert to absolute path for OSC
     video_path = video_path.resolve()
     
+    video2_path = None
+    if args.test in ["multi", "both"]:
+        video2_path = Path(args.video2)
+        if not video2_path.exists():
+            print(f"Warning: Second video not found: {video2_path}")
+            print("Skipping multi-layer test")
+            if args.test == "multi":
+                exit(0)
+            video2_path = None
+        else:
+            video2_path = video2_path.resolve()
+    
     try:
-        if args.test in ["basic", "both"]:
-            test_corner_deformation(video_path, args.duration)
+        # Both tests share one videocomposer instance; the layers the basic
+        # test loaded are unloaded in between so the multi-layer test does
+        # not depend on running second
+        with videocomposer_session(7700):
+            if args.test in ["basic", "both"]:
+                test_corner_deformation(video_path, args.duration)
             
-            if args.test == "both":
-                print("\n\nWaiting 3 seconds before multi-layer test...")
-                time.sleep(3)
-        
-        if args.test in ["multi", "both"]:
-            video2_path = Path(args.video2)
-            if not video2_path.exists():
-                print(f"Warning: Second video not found: {video2_path}")
-                print("Skipping multi-layer test")
-            else:
-                video2_path = video2_path.resolve()
+            if video2_path is not None:
+                if args.test == "both":
+                    reset_layers(("0",))
                 test_multi_layer_warping(video_path, video2_path, args.duration)
     
     except Exception as e:
@@ -12,6 +12,8 @@ from pathlib import Path
 import argparse
 
 try:
+    import pythonosc.osc_bundle_builder
+    import pythonosc.osc_message_builder
     import pythonosc.udp_client
 except ImportError:
     print("ERROR: python-osc not installed. Install with: pip install python-osc")
@@ -26,6 +28,31 @@ except ImportError:
     MTCHelper = None
 
 
+class LayerOSC:
+    """OSC addresses of one layer, formatted once per cue ID"""
+    
+    __slots__ = ('mtcfollow', 'position', 'scale', 'zorder')
+    
+    def __init__(self, cue_id):
+        base = f"/videocomposer/layer/{cue_id}"
+        self.mtcfollow = base + "/mtcfollow"
+        self.position = base + "/position"
+        self.scale = base + "/scale"
+        self.zorder = base + "/zorder"
+
+
+def build_bundle(messages):
+    """Build an OSC bundle, dispatched immediately, from (path, args) pairs"""
+    bundle = pythonosc.osc_bundle_builder.OscBundleBuilder(
+        pythonosc.osc_bundle_builder.IMMEDIATELY)
+    for path, args in messages:
+        msg = pythonosc.osc_message_builder.OscMessageBuilder(address=path)
+        for arg in args:
+            msg.add_arg(arg)
+        bundle.add_content(msg.build())
+    return bundle.build()
+
+
 def main():
     parser = argparse.ArgumentParser(description="Simple multi-layer test")
     parser.add_argument("--videocomposer", default="scripts/cuems-videocomposer-wrapper.sh",
@@ -40,6 +67,8 @@ def main():
                        help="Test duration in seconds (default: 60)")
     parser.add_argument("--fps", type=float, default=25.0,
                        help="MTC framerate (default: 25.0)")
+    parser.add_argument("--quiet", action="store_true",
+                       help="Don't print the per-second progress line")
     
     args = parser.parse_args()
     
@@ -57,11 +86,15 @@ def main():
     
     # Setup MTC
     mtc_helper = None
+    # MTC starts at frame 0 here, so frames are counted from this point,
+    # not from the start of the run phase
+    mtc_start = None
     if MTC_AVAILABLE:
         mtc_helper = MTCHelper(fps=args.fps, port=0, portname="SimpleTest")
         if mtc_helper.setup():
             print(f"MTC sender created (fps={args.fps})")
-            mtc_helper.start(start_frame=0)
+            if mtc_helper.start(start_frame=0):
+                mtc_start = time.monotonic()
             print("MTC playback started")
         else:
             print("WARNING: Failed to create MTC sender")
@@ -84,10 +117,9 @@ def main():
     print(f"Starting videocomposer: {' '.join(cmd)}")
     process = subprocess.Popen(
         cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1,
+        # Output is never read; a PIPE would fill up and stall videocomposer
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
         env=env
     )
     
@@ -101,45 +133,66 @@ def main():
     # Test cue IDs
     cue_id_1 = "test-layer-1"
     cue_id_2 = "test-layer-2"
+    layer1 = LayerOSC(cue_id_1)
+    layer2 = LayerOSC(cue_id_2)
     
-    # Load two layers
+    # Load two layers. videocomposer loads files asynchronously, so both
+    # loads go out together and share one settle time.
     print(f"\nLoading layer 1: {video1}")
-    osc_client.send_message("/videocomposer/layer/load", [str(video1), cue_id_1])
-    time.sleep(2)
-    
     print(f"Loading layer 2: {video2}")
-    osc_client.send_message("/videocomposer/layer/load", [str(video2), cue_id_2])
+    osc_client.send(build_bundle([
+        ("/videocomposer/layer/load", [str(video1), cue_id_1]),
+        ("/videocomposer/layer/load", [str(video2), cue_id_2]),
+    ]))
     time.sleep(2)
     
-    # Set mtcfollow on both layers
-    print("Setting MTC follow on both layers")
-    osc_client.send_message(f"/videocomposer/layer/{cue_id_1}/mtcfollow", [1])
-    osc_client.send_message(f"/videocomposer/layer/{cue_id_2}/mtcfollow", [1])
-    time.sleep(0.5)
-    
-    # Set different positions so we can see both layers
-    print("Setting layer positions")
-    osc_client.send_message(f"/videocomposer/layer/{cue_id_1}/position", [100, 100])
-    osc_client.send_message(f"/videocomposer/layer/{cue_id_1}/scale", [0.5, 0.5])
-    osc_client.send_message(f"/videocomposer/layer/{cue_id_1}/zorder", [1])
-    
-    osc_client.send_message(f"/videocomposer/layer/{cue_id_2}/position", [-100, -100])
-    osc_client.send_message(f"/videocomposer/layer/{cue_id_2}/scale", [0.5, 0.5])
-    osc_client.send_message(f"/videocomposer/layer/{cue_id_2}/zorder", [2])
-    time.sleep(0.5)
+    # Set mtcfollow on both layers, and different positions so we can see
+    # both layers. One bundle keeps the order without sleeps in between.
+    print("Setting MTC follow and layer positions")
+    osc_client.send(build_bundle([
+        (layer1.mtcfollow, [1]),
+        (layer2.mtcfollow, [1]),
+        
+        (layer1.position, [100, 100]),
+        (layer1.scale, [0.5, 0.5]),
+        (layer1.zorder, [1]),
+        
+        (layer2.position, [-100, -100]),
+        (layer2.scale, [0.5, 0.5]),
+        (layer2.zorder, [2]),
+    ]))
     
     print(f"\n=== Running for {args.duration} seconds with NO continuous OSC updates ===")
     print("Watch the videocomposer window for any corruption...")
     print("Press Ctrl+C to stop early.\n")
     
     try:
-        start_time = time.time()
-        while time.time() - start_time < args.duration:
-            elapsed = time.time() - start_time
-            expected_frame = int(elapsed * args.fps)
-            print(f"  Time: {elapsed:.1f}s, Expected frame: ~{expected_frame}", end='\r')
-            time.sleep(1)
-        print(f"\n\nTest completed after {args.duration} seconds!")
+        # process.wait() returns as soon as videocomposer exits, so a crash
+        # ends the test right away instead of after the full duration
+        start_time = time.monotonic()
+        deadline = start_time + args.duration
+        exited = False
+        while not exited:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if not args.quiet:
+                now = time.monotonic()
+                elapsed = now - start_time
+                if mtc_start is not None:
+                    expected_frame = int((now - mtc_start) * args.fps)
+                    print(f"  Time: {elapsed:.1f}s, Expected frame: ~{expected_frame}", end='\r')
+                else:
+                    print(f"  Time: {elapsed:.1f}s", end='\r')
+            try:
+                process.wait(timeout=remaining if args.quiet else min(remaining, 1.0))
+                exited = True
+            except subprocess.TimeoutExpired:
+                pass
+        if exited:
+            print(f"\n\nvideocomposer exited early (code {process.returncode})")
+        else:
+            print(f"\n\nTest completed after {args.duration} seconds!")
     except KeyboardInterrupt:
         print("\n\nInterrupted by user")
     finally:
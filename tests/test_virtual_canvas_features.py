@@ -18,16 +18,15 @@ import subprocess
 import time
 import sys
 import os
+import select
+import socket
+import stat
 from pathlib import Path
 import argparse
 import threading
 
-try:
-    import pythonosc.udp_client
-    from pythonosc import osc_message_builder
-except ImportError:
-    print("ERROR: python-osc not installed. Install with: pip install python-osc")
-    sys.exit(1)
+from osc_client import encode_bundle, encode_message
+from output_pump import spawn, wait_for_osc_port
 
 # Import shared MTC helper
 try:
@@ -37,6 +36,49 @@ except ImportError:
     MTC_AVAILABLE = False
     MTCHelper = None
 
+# Upper bound for videocomposer to open its OSC port after launch
+_STARTUP_TIMEOUT = 2.0
+# How far a step may run past its wait deadline and still be caught up by
+# the next wait; a longer overrun restarts the schedule
+_STEP_SLACK = 0.5
+
+
+def _mode_change(output_name, width, height, refresh, log_line):
+    """Pre-build the display/mode arguments and log line of one resolution change."""
+    return (output_name, str(width), str(height), str(refresh)), log_line + "\n"
+
+
+# Phase 3: live resolution changes on each output, ending back at 1080p
+_LIVE_MODE_CHANGES = tuple(
+    _mode_change(output_name, width, height, 60,
+                 f"\n=== Test: Change {output_name} to {width}x{height}@60Hz ===")
+    for output_name in ("eDP-1", "HDMI-A-1")
+    for width, height in ((1920, 1080), (1280, 720), (2560, 1440), (1920, 1080))
+)
+
+# Phase 9b: resolution changes on eDP-1 while the video plays
+_PLAYBACK_MODE_CHANGES = tuple(
+    _mode_change("eDP-1", width, height, refresh,
+                 f"\n      → Changing to {desc} ({width}x{height}@{refresh}Hz) while video plays...")
+    for width, height, refresh, desc in (
+        (1920, 1080, 60, "1080p (baseline)"),
+        (1280, 720, 60, "720p"),
+        (1920, 1080, 60, "1080p (restore)"),
+        (2560, 1440, 60, "1440p (if available)"),
+        (1920, 1080, 60, "1080p (final)"),
+    )
+)
+
+# Phase 9b: the same on the other outputs, if available. The outputs are
+# independent, so each step changes all of them in one bundle and they
+# settle together: (log line, display/mode args per output)
+_OTHER_OUTPUTS = ("HDMI-A-1", "DP-1")
+_PLAYBACK_OTHER_MODE_STEPS = tuple(
+    (f"\n          → Changing {', '.join(_OTHER_OUTPUTS)} to {desc} while video plays...\n",
+     tuple((output_name, str(width), str(height), "60") for output_name in _OTHER_OUTPUTS))
+    for width, height, desc in ((1920, 1080, "1080p"), (1280, 720, "720p"))
+)
+
 
 class VirtualCanvasFeaturesTest:
     def __init__(self, videocomposer_bin=None, video_file=None, osc_port=7770, fps=25.0, mtc_port=0):
@@ -46,15 +88,22 @@ class VirtualCanvasFeaturesTest:
         self.fps = fps
         self.mtc_port = mtc_port
         self.videocomposer_process = None
-        self.osc_client = None
+        # pidfd of videocomposer (Linux 5.3+), polled to detect its exit
+        self._pidfd = None
+        # End of the last wait_running(); the next wait is measured from it
+        self._step_deadline = None
+        # UDP socket connected to videocomposer's OSC port
+        self.osc_sock = None
         self.mtc_helper = None
         self.stop_monitoring = threading.Event()
+        # Messages queued by send_osc() between begin_batch() and flush_osc_batch()
+        self._batch = None
         
         if MTC_AVAILABLE:
             self.mtc_helper = MTCHelper(fps=fps, port=mtc_port, portname="VirtualCanvasTest")
     
     def _find_videocomposer(self, provided_path=None):
-        """Find videocomposer binary or wrapper script."""
+        """Find videocomposer binary or wrapper script, stat()ing each candidate once."""
         if provided_path:
             path = Path(provided_path)
             if path.exists():
@@ -74,11 +123,14 @@ class VirtualCanvasFeaturesTest:
         ]
         
         for path in possible_paths:
-            if path.exists():
-                # Check if executable (for scripts) or is a file (for binaries)
-                if path.is_file() and (os.access(path, os.X_OK) or path.suffix == ''):
-                    print(f"Found videocomposer: {path}")
-                    return path
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            # Check if executable (for scripts) or is a file (for binaries)
+            if stat.S_ISREG(st.st_mode) and (st.st_mode & 0o111 or path.suffix == ''):
+                print(f"Found videocomposer: {path}")
+                return path
         
         raise FileNotFoundError(
             "videocomposer not found. Build the application first.\n"
@@ -134,17 +186,23 @@ class VirtualCanvasFeaturesTest:
         # Copy environment to preserve LD_LIBRARY_PATH set by wrapper script
         env = os.environ.copy()
         
-        # Stream output to terminal for debugging
-        self.videocomposer_process = subprocess.Popen(
+        # Stream output to terminal for debugging. Merging stderr into
+        # stdout keeps error messages in order with the rest of the log, at
+        # the cost of spawn()'s posix_spawn path: the dup onto fd 2 makes
+        # CPython fall back to fork+exec.
+        self.videocomposer_process = spawn(
             cmd,
             stdout=None,  # Let output go to terminal
             stderr=subprocess.STDOUT,  # Merge stderr to stdout
-            text=True,
             env=env
         )
+        try:
+            self._pidfd = os.pidfd_open(self.videocomposer_process.pid)
+        except (AttributeError, OSError):
+            # Not Linux, Python < 3.9 or kernel < 5.3: cleanup() uses wait()
+            self._pidfd = None
         
-        # Wait a bit for startup
-        time.sleep(2)
+        wait_for_osc_port(self.videocomposer_process, self.osc_port, _STARTUP_TIMEOUT)
         
         if self.videocomposer_process.poll() is not None:
             print("ERROR: videocomposer exited immediately")
@@ -156,7 +214,10 @@ class VirtualCanvasFeaturesTest:
     def connect_osc(self):
         """Connect OSC client."""
         try:
-            self.osc_client = pythonosc.udp_client.SimpleUDPClient("127.0.0.1", self.osc_port)
+            # A connected socket sends with send(), with no per-message
+            # destination lookup
+            self.osc_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.osc_sock.connect(("127.0.0.1", self.osc_port))
             print(f"OSC client connected to port {self.osc_port}")
             return True
         except Exception as e:
@@ -164,14 +225,20 @@ class VirtualCanvasFeaturesTest:
             return False
     
     def send_osc(self, path, *args, verbose=True):
-        """Send OSC message."""
-        if not self.osc_client:
+        """Send OSC message, or queue it if a batch is open (see begin_batch)."""
+        if not self.osc_sock:
             if verbose:
                 print("ERROR: OSC client not connected")
             return False
         
         try:
-            self.osc_client.send_message(path, list(args))
+            # encode_message caches the address + type tag per path, so the
+            # repeated mode/region/blend sends only encode their arguments
+            dgram = encode_message(path, args)
+            if self._batch is None:
+                self.osc_sock.send(dgram)
+            else:
+                self._batch.append(dgram)
             if verbose:
                 print(f"Sent: {path} {list(args)}")
             return True
@@ -180,17 +247,75 @@ class VirtualCanvasFeaturesTest:
                 print(f"ERROR: Failed to send OSC message: {e}")
             return False
     
+    def begin_batch(self):
+        """Queue subsequent send_osc() messages until flush_osc_batch()."""
+        self._batch = []
+    
+    def flush_osc_batch(self):
+        """Send the messages queued since begin_batch() as one OSC bundle."""
+        batch, self._batch = self._batch, None
+        if not batch:
+            return True
+        try:
+            self.osc_sock.send(encode_bundle(batch))
+            return True
+        except Exception as e:
+            print(f"ERROR: Failed to send OSC bundle: {e}")
+            return False
+    
+    def wait_running(self, seconds):
+        """
+        Wait for the given time while videocomposer keeps running.
+        
+        videocomposer sends no OSC replies, so there is nothing to wait on
+        after a command; this at least ends the wait as soon as it exits.
+        
+        Each wait ends `seconds` after the previous wait's deadline rather
+        than after this call, so time spent sending and printing between
+        steps doesn't accumulate over the suite. If the previous step overran
+        its deadline by more than _STEP_SLACK, the schedule restarts from now,
+        so this step still gets its full `seconds`.
+        
+        Raises:
+            RuntimeError: if videocomposer exits during the wait
+        """
+        now = time.monotonic()
+        previous = self._step_deadline
+        if previous is None or now - previous > _STEP_SLACK:
+            previous = now
+        deadline = previous + seconds
+        self._step_deadline = deadline
+        try:
+            returncode = self.videocomposer_process.wait(timeout=max(0.0, deadline - now))
+        except subprocess.TimeoutExpired:
+            return
+        raise RuntimeError(f"videocomposer exited with code {returncode}")
+    
     def cleanup(self):
         """Cleanup resources."""
         self.stop_mtc()
         if self.videocomposer_process:
             self.videocomposer_process.terminate()
-            try:
-                self.videocomposer_process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                self.videocomposer_process.kill()
+            if self._pidfd is not None:
+                # The pidfd becomes readable the moment the process exits,
+                # unlike wait(timeout), which polls with growing sleeps
+                poller = select.poll()
+                poller.register(self._pidfd, select.POLLIN)
+                if not poller.poll(5000):
+                    self.videocomposer_process.kill()
+                self.videocomposer_process.wait()
+                os.close(self._pidfd)
+                self._pidfd = None
+            else:
+                try:
+                    self.videocomposer_process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    self.videocomposer_process.kill()
         if self.mtc_helper:
             self.mtc_helper.cleanup()
+        if self.osc_sock:
+            self.osc_sock.close()
+            self.osc_sock = None
     
     # ============================================================================
     # Test Functions
@@ -216,13 +341,20 @@ class VirtualCanvasFeaturesTest:
         print("\n=== Test: Resolution Mode Status ===")
         return self.send_osc("/videocomposer/display/resolution_mode")
     
-    def test_display_mode_change(self, output_name, width, height, refresh=0):
-        """Test /videocomposer/display/mode <name> <width> <height> [refresh]"""
-        print(f"\n=== Test: Change {output_name} to {width}x{height}@{refresh}Hz ===")
-        args = [output_name, str(width), str(height)]
-        if refresh > 0:
-            args.append(str(refresh))
-        return self.send_osc("/videocomposer/display/mode", *args)
+    def fast_mode_change(self, change):
+        """Send one pre-built entry of the _*_MODE_CHANGES tables."""
+        args, log_line = change
+        sys.stdout.write(log_line)
+        return self.send_osc("/videocomposer/display/mode", *args, verbose=False)
+    
+    def fast_mode_step(self, step):
+        """Send one pre-built _PLAYBACK_OTHER_MODE_STEPS entry as one bundle."""
+        log_line, changes = step
+        sys.stdout.write(log_line)
+        self.begin_batch()
+        for args in changes:
+            self.send_osc("/videocomposer/display/mode", *args, verbose=False)
+        return self.flush_osc_batch()
     
     def test_display_region(self, output_name, canvas_x, canvas_y, width=0, height=0):
         """Test /videocomposer/display/region <name> <x> <y> [width] [height]"""
@@ -304,17 +436,17 @@ class VirtualCanvasFeaturesTest:
             print("PHASE 1: Display Discovery")
             print("=" * 70)
             
-            self.test_display_list()
-            time.sleep(0.5)
+            # The discovery queries and the Phase 2 status query only log and
+            # don't depend on each other, so they all go out as one bundle
+            self.begin_batch()
             
+            self.test_display_list()
             self.test_output_list()
-            time.sleep(0.5)
             
             # Get available modes for first output (assuming eDP-1 or HDMI-A-1)
             # We'll try common names
             for output_name in ["eDP-1", "HDMI-A-1", "DP-1"]:
                 self.test_display_modes(output_name)
-                time.sleep(0.5)
             
             # ====================================================================
             # Phase 2: Resolution Mode Testing
@@ -324,16 +456,17 @@ class VirtualCanvasFeaturesTest:
             print("=" * 70)
             
             self.test_resolution_mode_status()
-            time.sleep(0.5)
+            self.flush_osc_batch()
+            self.wait_running(0.5)
             
             # Test different resolution modes
             for mode in ["1080p", "native", "maximum", "720p", "4k"]:
                 self.test_resolution_mode(mode)
-                time.sleep(1)
+                self.wait_running(1)
             
             # Set back to 1080p for consistency
             self.test_resolution_mode("1080p")
-            time.sleep(1)
+            self.wait_running(1)
             
             # ====================================================================
             # Phase 3: Live Resolution Changes
@@ -342,22 +475,10 @@ class VirtualCanvasFeaturesTest:
             print("PHASE 3: Live Resolution Changes")
             print("=" * 70)
             
-            # Try changing resolution on first output
-            for output_name in ["eDP-1", "HDMI-A-1"]:
-                # Try different resolutions
-                resolutions = [
-                    (1920, 1080, 60),
-                    (1280, 720, 60),
-                    (2560, 1440, 60),
-                ]
-                
-                for width, height, refresh in resolutions:
-                    self.test_display_mode_change(output_name, width, height, refresh)
-                    time.sleep(2)  # Wait for mode change to complete
-                
-                # Restore to 1080p
-                self.test_display_mode_change(output_name, 1920, 1080, 60)
-                time.sleep(2)
+            # Try different resolutions on each output, then restore 1080p
+            for change in _LIVE_MODE_CHANGES:
+                self.fast_mode_change(change)
+                self.wait_running(2)  # Wait for mode change to complete
             
             # ====================================================================
             # Phase 4: Output Region Configuration
@@ -369,19 +490,19 @@ class VirtualCanvasFeaturesTest:
             # Configure regions for multi-display setup
             # Display 1 at (0, 0)
             self.test_display_region("eDP-1", 0, 0, 1920, 1080)
-            time.sleep(0.5)
+            self.wait_running(0.5)
             
             # Display 2 at (1920, 0) - side by side
             self.test_display_region("HDMI-A-1", 1920, 0, 1920, 1080)
-            time.sleep(0.5)
+            self.wait_running(0.5)
             
             # Try stacked layout
             self.test_display_region("HDMI-A-1", 0, 1080, 1920, 1080)
-            time.sleep(0.5)
+            self.wait_running(0.5)
             
             # Restore side-by-side
             self.test_display_region("HDMI-A-1", 1920, 0, 1920, 1080)
-            time.sleep(0.5)
+            self.wait_running(0.5)
             
             # ====================================================================
             # Phase 5: Edge Blending
@@ -390,22 +511,24 @@ class VirtualCanvasFeaturesTest:
             print("PHASE 5: Edge Blending")
             print("=" * 70)
             
-            # Test blend on left edge (for overlapping projectors)
+            # Test blend on left edge of one output and right edge of the
+            # other (overlapping projectors), applied together in one bundle
+            self.begin_batch()
             self.test_display_blend("eDP-1", 100, 0, 0, 0, 2.2)
-            time.sleep(0.5)
-            
-            # Test blend on right edge
             self.test_display_blend("HDMI-A-1", 0, 100, 0, 0, 2.2)
-            time.sleep(0.5)
+            self.flush_osc_batch()
+            self.wait_running(0.5)
             
             # Test blend on all edges
             self.test_display_blend("eDP-1", 50, 50, 50, 50, 2.2)
-            time.sleep(0.5)
+            self.wait_running(0.5)
             
             # Disable blending
+            self.begin_batch()
             self.test_display_blend("eDP-1", 0, 0, 0, 0, 2.2)
             self.test_display_blend("HDMI-A-1", 0, 0, 0, 0, 2.2)
-            time.sleep(0.5)
+            self.flush_osc_batch()
+            self.wait_running(0.5)
             
             # ====================================================================
             # Phase 6: Geometric Warping
@@ -418,7 +541,7 @@ class VirtualCanvasFeaturesTest:
             # This is a placeholder test
             print("NOTE: Warp mesh testing requires actual mesh files")
             # self.test_display_warp("eDP-1", "/path/to/warp_mesh.json")
-            # time.sleep(0.5)
+            # self.wait_running(0.5)
             
             # ====================================================================
             # Phase 7: Configuration Persistence
@@ -430,11 +553,11 @@ class VirtualCanvasFeaturesTest:
             # Save configuration
             config_path = "/tmp/videocomposer_test_config.conf"
             self.test_config_save(config_path)
-            time.sleep(0.5)
+            self.wait_running(0.5)
             
             # Load configuration
             self.test_config_load(config_path)
-            time.sleep(0.5)
+            self.wait_running(0.5)
             
             # ====================================================================
             # Phase 8: Virtual Output Capture
@@ -445,19 +568,19 @@ class VirtualCanvasFeaturesTest:
             
             # Check capture status
             self.test_output_capture("status")
-            time.sleep(0.5)
+            self.wait_running(0.5)
             
             # Enable capture
             self.test_output_capture("enable", 1920, 1080)
-            time.sleep(0.5)
+            self.wait_running(0.5)
             
             # Check status again
             self.test_output_capture("status")
-            time.sleep(0.5)
+            self.wait_running(0.5)
             
             # Disable capture
             self.test_output_capture("disable")
-            time.sleep(0.5)
+            self.wait_running(0.5)
             
             # ====================================================================
             # Phase 9: Video Playback with MTC
@@ -470,63 +593,51 @@ class VirtualCanvasFeaturesTest:
                 # Load video file
                 print(f"\nLoading video: {self.video_file}")
                 self.send_osc("/videocomposer/layer/load", self.video_file, "test_video")
-                time.sleep(1)
+                self.wait_running(1)
                 
                 # Enable mtcfollow
                 print("\nEnabling mtcfollow")
                 self.send_osc("/videocomposer/layer/test_video/mtcfollow", "1")
-                time.sleep(0.5)
+                self.wait_running(0.5)
                 
                 # Start MTC playback
                 print("\nStarting MTC playback...")
                 if self.start_mtc(0):
                     print("MTC started - video should be playing now")
-                    time.sleep(5)  # Let video play for 5 seconds
+                    self.wait_running(5)  # Let video play for 5 seconds
                     
                     # Test layer positioning on virtual canvas
                     print("\n9a. Positioning layer on virtual canvas...")
                     self.send_osc("/videocomposer/layer/test_video/position", 960, 540)  # Center of display 1
-                    time.sleep(2)
+                    self.wait_running(2)
                     
                     self.send_osc("/videocomposer/layer/test_video/position", 2880, 540)  # Center of display 2
-                    time.sleep(2)
+                    self.wait_running(2)
                     
                     self.send_osc("/videocomposer/layer/test_video/position", 1920, 540)  # Spanning both displays
-                    time.sleep(2)
+                    self.wait_running(2)
                     
                     # Test 9b: On-the-fly resolution changes during playback
                     print("\n9b. CRITICAL TEST: On-the-fly resolution changes during video playback")
                     print("    Video should continue playing smoothly through each resolution change")
                     
                     # Sequence of resolution changes while video plays
-                    resolution_changes = [
-                        (1920, 1080, 60, "1080p (baseline)"),
-                        (1280, 720, 60, "720p"),
-                        (1920, 1080, 60, "1080p (restore)"),
-                        (2560, 1440, 60, "1440p (if available)"),
-                        (1920, 1080, 60, "1080p (final)"),
-                    ]
-                    
-                    for width, height, refresh, desc in resolution_changes:
-                        print(f"\n      → Changing to {desc} ({width}x{height}@{refresh}Hz) while video plays...")
-                        self.test_display_mode_change("eDP-1", width, height, refresh)
-                        print(f"        Waiting 4 seconds for mode change to complete...")
-                        time.sleep(4)  # Wait for mode change + verify video still playing
-                        print(f"        ✓ Resolution changed - video should still be playing smoothly")
+                    for change in _PLAYBACK_MODE_CHANGES:
+                        self.fast_mode_change(change)
+                        print("        Waiting 4 seconds for mode change to complete...")
+                        self.wait_running(4)  # Wait for mode change + verify video still playing
+                        print("        ✓ Resolution changed - video should still be playing smoothly")
                     
                     # Test on second output if available
-                    print("\n      Testing resolution changes on second output while video plays...")
-                    for output in ["HDMI-A-1", "DP-1"]:
-                        print(f"\n        Testing {output}:")
-                        for width, height, refresh, desc in [(1920, 1080, 60, "1080p"), (1280, 720, 60, "720p")]:
-                            print(f"          → Changing {output} to {desc} while video plays...")
-                            self.test_display_mode_change(output, width, height, refresh)
-                            time.sleep(4)
-                            print(f"            ✓ Changed - video should still be playing")
+                    print("\n      Testing resolution changes on the other outputs while video plays...")
+                    for step in _PLAYBACK_OTHER_MODE_STEPS:
+                        self.fast_mode_step(step)
+                        self.wait_running(4)
+                        print("            ✓ Changed - video should still be playing")
                     
                     print("\n    ✓ On-the-fly resolution change test completed")
                     print("      If video played continuously through all changes, test PASSED")
-                    time.sleep(2)
+                    self.wait_running(2)
                     
                     self.stop_mtc()
                 else:
@@ -549,9 +660,13 @@ class VirtualCanvasFeaturesTest:
             traceback.print_exc()
             return False
         finally:
-            # Keep running for a bit to see results
-            print("\nKeeping videocomposer running for 5 seconds...")
-            time.sleep(5)
+            # Keep running for a bit to see results (unless it already exited)
+            if self.videocomposer_process.poll() is None:
+                print("\nKeeping videocomposer running for 5 seconds...")
+                try:
+                    self.videocomposer_process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    pass
             self.cleanup()
 
 